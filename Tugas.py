@@ -1,12 +1,1949 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
 import networkx as nx
-from collections import deque
-from datetime import datetime, timedelta
+from networkx.algorithms.flow import boykov_kolmogorov
+import os
+import re
+import io
+import json
+import time
+import hashlib
+import argparse
+import threading
+import heapq
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from datetime import datetime
+
+DEPENDENCY_TYPES = ('FS', 'SS', 'FF', 'SF')
+_DEPENDENCY_PATTERN = re.compile(r'^(\d+)(?:\.0+)?\s*(FS|SS|FF|SF)?\s*(?:([+-])\s*(\d+))?$', re.IGNORECASE)
+
+def parse_dependencies(text):
+    """Parse a dependency string such as "1,2,3SS+2,4FF-1".
+
+    Returns a list of (predecessor ID, type, lag) tuples where type is one
+    of FS/SS/FF/SF (FS when omitted) and lag is in days.  Raises
+    ValueError on malformed entries.
+    """
+    deps = []
+    for part in str(text).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        match = _DEPENDENCY_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Format dependensi salah: {part}")
+        pred, kind, sign, lag = match.groups()
+        lag = int(lag) if lag else 0
+        deps.append((int(pred), (kind or 'FS').upper(), -lag if sign == '-' else lag))
+    return deps
+
+def normalize_dependencies(deps):
+    """Coerce IDs, strings or (ID, type, lag) sequences to dependency tuples"""
+    if isinstance(deps, str):
+        return parse_dependencies(deps)
+    result = []
+    for dep in deps or []:
+        if isinstance(dep, str):
+            result.extend(parse_dependencies(dep))
+        elif isinstance(dep, (list, tuple)):
+            pred, kind, lag = (list(dep) + ['FS', 0])[:3]
+            kind = str(kind).upper()
+            if kind not in DEPENDENCY_TYPES:
+                raise ValueError(f"Tipe dependensi tidak dikenal: {kind}")
+            result.append((int(pred), kind, int(lag)))
+        else:
+            result.append((int(dep), 'FS', 0))
+    return result
+
+def format_dependencies(deps):
+    """Inverse of parse_dependencies, plain FS links are written as the ID"""
+    parts = []
+    for pred, kind, lag in normalize_dependencies(deps):
+        text = str(pred)
+        if kind != 'FS' or lag:
+            text += kind
+        if lag:
+            text += f"{lag:+d}"
+        parts.append(text)
+    return ','.join(parts)
+
+class CPMNetwork:
+    """Activity network compiled into NumPy edge arrays.
+
+    The topological levels are computed once, after which the forward and
+    backward passes run as one vectorized reduction per level.  This makes
+    it cheap to re-evaluate the same network with different durations.
+    Edges carry their relation type (FS/SS/FF/SF) and lag, so generalized
+    precedence costs the same reductions as plain finish-to-start.
+    """
+    def __init__(self, activities):
+        n = len(activities)
+        self.ids = np.array([a['id'] for a in activities], dtype=np.int64)
+        self.index = {aid: i for i, aid in enumerate(self.ids.tolist())}
+        self.durations = np.array([a['duration'] for a in activities], dtype=np.int64)
+
+        src, dst, kinds, lags = [], [], [], []
+        for i, activity in enumerate(activities):
+            for pred, kind, lag in normalize_dependencies(activity['dependencies']):
+                if pred not in self.index:
+                    raise ValueError(f"Dependensi {pred} pada kegiatan {activity['id']} tidak ditemukan!")
+                src.append(self.index[pred])
+                dst.append(i)
+                kinds.append(kind)
+                lags.append(lag)
+        self.src = np.array(src, dtype=np.int64)
+        self.dst = np.array(dst, dtype=np.int64)
+        self.lag = np.array(lags, dtype=np.int64)
+        kinds = np.array(kinds, dtype='<U2')
+        # FS/FF edges leave the predecessor's finish, FF/SF edges reach the successor's finish
+        self.from_finish = (kinds == 'FS') | (kinds == 'FF')
+        self.to_finish = (kinds == 'FF') | (kinds == 'SF')
+
+        # Topological levels (Kahn's algorithm, one frontier at a time)
+        order = np.argsort(self.src, kind='stable')
+        succ = self.dst[order]
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(self.src, minlength=n))))
+        self.succ, self.succ_offsets = succ, offsets
+        in_degree = np.bincount(self.dst, minlength=n)
+        level = np.zeros(n, dtype=np.int64)
+        frontier = np.flatnonzero(in_degree == 0)
+        seen = 0
+        depth = 0
+        while frontier.size:
+            level[frontier] = depth
+            seen += frontier.size
+            depth += 1
+            targets = self._successors(frontier)
+            if not targets.size:
+                break
+            np.subtract.at(in_degree, targets, 1)
+            frontier = np.unique(targets[in_degree[targets] == 0])
+
+        if seen != n:
+            raise ValueError("Terdapat circular dependency!")
+
+        self.level = level
+        self.depth = depth
+
+        # Nodes grouped by level
+        self.node_order = np.argsort(level, kind='stable')
+        self.node_bounds = np.searchsorted(level[self.node_order], np.arange(depth + 1))
+
+        # Edges grouped by successor level (forward) and predecessor level (backward)
+        fwd_order = np.argsort(level[self.dst], kind='stable')
+        fwd_bounds = np.searchsorted(level[self.dst][fwd_order], np.arange(depth + 1))
+        bwd_order = np.argsort(level[self.src], kind='stable')
+        bwd_bounds = np.searchsorted(level[self.src][bwd_order], np.arange(depth + 1))
+        self.fwd_levels = [self._edge_slice(fwd_order[fwd_bounds[lvl]:fwd_bounds[lvl + 1]]) for lvl in range(depth)]
+        self.bwd_levels = [self._edge_slice(bwd_order[bwd_bounds[lvl]:bwd_bounds[lvl + 1]]) for lvl in range(depth)]
+        self.level_nodes = [self.node_order[self.node_bounds[lvl]:self.node_bounds[lvl + 1]] for lvl in range(depth)]
+
+    def _successors(self, nodes):
+        """Successor indices of ``nodes`` (with repeats) from the CSR arrays"""
+        counts = self.succ_offsets[nodes + 1] - self.succ_offsets[nodes]
+        total = int(counts.sum())
+        starts = np.repeat(self.succ_offsets[nodes] - np.cumsum(counts) + counts, counts)
+        return self.succ[starts + np.arange(total)]
+
+    def descendants(self, nodes):
+        """Boolean mask of ``nodes`` and everything downstream of them"""
+        mask = np.zeros(len(self.ids), dtype=bool)
+        frontier = np.unique(np.asarray(nodes, dtype=np.int64))
+        while frontier.size:
+            mask[frontier] = True
+            targets = self._successors(frontier)
+            frontier = np.unique(targets[~mask[targets]])
+        return mask
+
+    def _edge_slice(self, edges):
+        return (self.src[edges], self.dst[edges], self.from_finish[edges],
+                self.to_finish[edges], self.lag[edges])
+
+    @staticmethod
+    def _forward_candidate(src, dst, from_finish, to_finish, lag, es, ef, d):
+        """Earliest start each edge allows for its successor"""
+        return np.where(from_finish, ef[src], es[src]) + lag - np.where(to_finish, d[dst], 0)
+
+    @staticmethod
+    def _backward_candidate(src, dst, from_finish, to_finish, lag, ls, lf, d):
+        """Latest finish each edge allows for its predecessor"""
+        return np.where(to_finish, lf[dst], ls[dst]) - lag + np.where(from_finish, 0, d[src])
+
+    def edge_slack(self, es, ef, durations=None):
+        """Per-edge gap between the successor's ES and what the edge requires"""
+        d = self.durations if durations is None else np.asarray(durations)
+        return es[self.dst] - self._forward_candidate(self.src, self.dst, self.from_finish,
+                                                      self.to_finish, self.lag, es, ef, d)
+
+    def solve(self, durations=None, earliest=None, fixed=None, previous=None, affected=None):
+        """Run the forward and backward pass, returning ES, EF, LS, LF arrays.
+
+        ``earliest`` gives a per-activity lower bound on ES and ``fixed``
+        marks activities whose ES is exactly ``earliest`` (actual starts).
+        With ``previous`` (ES, EF) and an ``affected`` mask, the forward
+        pass only recomputes the affected activities and keeps the rest.
+        """
+        d = self.durations if durations is None else np.asarray(durations)
+        n = len(d)
+        floor = np.zeros(n, dtype=d.dtype) if earliest is None else np.asarray(earliest, dtype=d.dtype)
+        if previous is None or affected is None:
+            es = floor.copy()
+            ef = np.zeros(n, dtype=d.dtype)
+            affected = np.ones(n, dtype=bool)
+        else:
+            es, ef = previous[0].copy(), previous[1].copy()
+            es[affected] = floor[affected]
+
+        # Forward pass (only levels and edges that reach affected activities)
+        first = int(self.level[affected].min()) if affected.any() else self.depth
+        for edges, nodes in zip(self.fwd_levels[first:], self.level_nodes[first:]):
+            if edges[0].size:
+                keep = affected[edges[1]]
+                if not keep.all():
+                    edges = tuple(column[keep] for column in edges)
+                np.maximum.at(es, edges[1], self._forward_candidate(*edges, es, ef, d))
+            nodes = nodes[affected[nodes]]
+            if fixed is not None:
+                pinned = nodes[fixed[nodes]]
+                es[pinned] = floor[pinned]
+            ef[nodes] = es[nodes] + d[nodes]
+
+        # Backward pass
+        project_duration = ef.max() if n else 0
+        lf = np.full(n, project_duration, dtype=d.dtype)
+        ls = np.zeros(n, dtype=d.dtype)
+        for edges, nodes in zip(reversed(self.bwd_levels), reversed(self.level_nodes)):
+            if edges[0].size:
+                np.minimum.at(lf, edges[0], self._backward_candidate(*edges, ls, lf, d))
+            ls[nodes] = lf[nodes] - d[nodes]
+
+        return es, ef, ls, lf
+
+class WorkCalendar:
+    """Working calendar used to turn CPM day offsets into calendar dates.
+
+    Offsets count working days from the project start, skipping the
+    non-working weekdays of ``weekmask`` (Monday first) and ``holidays``.
+    All conversions go through NumPy business-day functions in one pass.
+    """
+    def __init__(self, start, weekmask='1111100', holidays=()):
+        self.weekmask = weekmask
+        self.holidays = np.array(sorted(holidays), dtype='datetime64[D]')
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        self.start = np.busday_offset(np.datetime64(start, 'D'), 0, roll='forward',
+                                      busdaycal=self.busdaycal)
+
+    def start_dates(self, offsets):
+        """Date on which work starts for each start offset"""
+        return np.busday_offset(self.start, np.asarray(offsets), busdaycal=self.busdaycal)
+
+    def finish_dates(self, finish_offsets, start_offsets):
+        """Last working day for each finish offset (finish is exclusive)"""
+        last = np.maximum(np.asarray(finish_offsets) - 1, np.asarray(start_offsets))
+        return np.busday_offset(self.start, last, busdaycal=self.busdaycal)
+
+    def to_dates(self, es, ef, ls, lf):
+        """Convert ES/EF/LS/LF offset arrays to datetime.date object arrays"""
+        starts = self.start_dates(np.concatenate((es, ls)))
+        finishes = self.finish_dates(np.concatenate((ef, lf)), np.concatenate((es, ls)))
+        n = len(es)
+        starts = starts.astype(object)
+        finishes = finishes.astype(object)
+        return starts[:n], finishes[:n], starts[n:], finishes[n:]
+
+def compute_cpm(activities, calendar=None, network=None, schedule=None):
+    """Calculate CPM for a list of activities.
+
+    Returns a dictionary keyed by activity ID, raises ValueError when the
+    network is invalid (circular or unknown dependency).  When a
+    WorkCalendar is given every activity also gets its calendar dates.
+    ``network`` reuses a CPMNetwork already built for ``activities`` and
+    ``schedule`` its solved (ES, EF, LS, LF) arrays.
+    """
+    if not activities:
+        return None
+
+    if schedule is None:
+        if network is None:
+            network = CPMNetwork(activities)
+        schedule = network.solve()
+    es, ef, ls, lf = schedule
+    slack = ls - es
+    if calendar is not None:
+        start_dates, finish_dates, late_start_dates, late_finish_dates = calendar.to_dates(es, ef, ls, lf)
+
+    result = {}
+    for i, activity in enumerate(activities):
+        result[activity['id']] = {
+            'name': activity['name'],
+            'duration': activity['duration'],
+            'ES': int(es[i]),
+            'EF': int(ef[i]),
+            'LS': int(ls[i]),
+            'LF': int(lf[i]),
+            'slack': int(slack[i]),
+            'is_critical': bool(slack[i] == 0),
+            'dependencies': normalize_dependencies(activity['dependencies'])
+        }
+        if calendar is not None:
+            result[activity['id']].update({
+                'start_date': start_dates[i],
+                'finish_date': finish_dates[i],
+                'late_start_date': late_start_dates[i],
+                'late_finish_date': late_finish_dates[i]
+            })
+
+    return result
+
+class ScheduleIndex:
+    """Path and slack lookups over a solved CPMNetwork.
+
+    Activities are kept sorted by slack so "slack <= N" queries are a
+    binary search.  Critical paths are enumerated by walking the subgraph
+    of tight edges (edges whose constraint fixes the successor's early
+    start) between critical activities.
+    """
+    def __init__(self, network, durations=None):
+        self.network = network
+        self.durations = network.durations if durations is None else np.asarray(durations)
+        self.es, self.ef, self.ls, self.lf = network.solve(self.durations)
+        self.slack = self.ls - self.es
+        self.project_duration = self.ef.max() if len(self.ef) else 0
+
+        self.slack_order = np.argsort(self.slack, kind='stable')
+        self.sorted_slack = self.slack[self.slack_order]
+
+        critical = self.slack == 0
+        src, dst = network.src, network.dst
+        tight = critical[src] & critical[dst] & (network.edge_slack(self.es, self.ef, self.durations) == 0)
+        self.tight_src = src[tight]
+        self.tight_dst = dst[tight]
+
+    def critical_edges(self):
+        """Tight links between critical activities as (from ID, to ID) pairs"""
+        ids = self.network.ids
+        return list(zip(ids[self.tight_src].tolist(), ids[self.tight_dst].tolist()))
+
+    def within_slack(self, max_slack):
+        """IDs of activities with slack <= max_slack, lowest slack first"""
+        count = np.searchsorted(self.sorted_slack, max_slack, side='right')
+        return self.network.ids[self.slack_order[:count]]
+
+    def critical_paths(self, limit=20):
+        """List up to ``limit`` complete critical paths as lists of IDs"""
+        n = len(self.slack)
+        order = np.argsort(self.tight_src, kind='stable')
+        succ = self.tight_dst[order].tolist()
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(self.tight_src, minlength=n)))).tolist()
+        has_pred = np.bincount(self.tight_dst, minlength=n) > 0
+        starts = np.flatnonzero((self.slack == 0) & ~has_pred & (self.es == 0)).tolist()
+        ends = (self.ef == self.project_duration).tolist()
+        ids = self.network.ids.tolist()
+
+        # A path may only stop at a finishing activity none of whose tight
+        # successors still lead to a finish (e.g. a closing milestone)
+        reaches_end = list(ends)
+        final = list(ends)
+        for node in reversed(self.network.node_order.tolist()):
+            extends = any(reaches_end[s] for s in succ[offsets[node]:offsets[node + 1]])
+            reaches_end[node] = reaches_end[node] or extends
+            final[node] = final[node] and not extends
+        starts = [s for s in starts if reaches_end[s]]
+
+        paths = []
+        seen = set()
+        for start in starts:
+            stack = [(start, offsets[start])]
+            path = [start]
+            while stack and len(paths) < limit:
+                node, pos = stack[-1]
+                if pos == offsets[node] and final[node]:
+                    key = tuple(path)
+                    if key not in seen:
+                        seen.add(key)
+                        paths.append([ids[i] for i in path])
+                while pos < offsets[node + 1] and not reaches_end[succ[pos]]:
+                    pos += 1
+                if pos < offsets[node + 1]:
+                    stack[-1] = (node, pos + 1)
+                    nxt = succ[pos]
+                    stack.append((nxt, offsets[nxt]))
+                    path.append(nxt)
+                else:
+                    stack.pop()
+                    path.pop()
+            if len(paths) >= limit:
+                break
+        return paths
+
+    def longest_paths(self, k=5):
+        """Top-k longest start-to-finish paths as (length, [IDs]) tuples"""
+        network = self.network
+        n = len(self.durations)
+        d = self.durations.tolist()
+        preds = [[] for _ in range(n)]
+        for p, s, from_finish, to_finish, lag in zip(network.src.tolist(), network.dst.tolist(),
+                                                     network.from_finish.tolist(), network.to_finish.tolist(),
+                                                     network.lag.tolist()):
+            preds[s].append((p, from_finish, lag - (d[s] if to_finish else 0)))
+
+        # A path may stop at an activity unless some outgoing edge always extends its finish
+        durations = self.durations
+        extension = (network.lag + np.where(network.to_finish, 0, durations[network.dst])
+                     - np.where(network.from_finish, 0, durations[network.src]))
+        extended = np.bincount(network.src[extension >= 0], minlength=n) > 0
+
+        # best[i] holds up to k (finish along the path, pred, pred_rank) entries ending at i
+        best = [None] * n
+        for node in network.node_order.tolist():
+            if not preds[node]:
+                best[node] = [(d[node], -1, -1)]
+                continue
+            candidates = ((max(0, (finish if from_finish else finish - d[p]) + offset) + d[node], p, rank)
+                          for p, from_finish, offset in preds[node]
+                          for rank, (finish, _, _) in enumerate(best[p]))
+            best[node] = heapq.nlargest(k, candidates, key=lambda c: c[0])
+
+        finals = ((entry[0], node, rank)
+                  for node in np.flatnonzero(~extended).tolist()
+                  for rank, entry in enumerate(best[node]))
+        ids = network.ids.tolist()
+        result = []
+        for length, node, rank in heapq.nlargest(k, finals, key=lambda c: c[0]):
+            path = []
+            while node != -1:
+                path.append(ids[node])
+                _, node, rank = best[node][rank]
+            result.append((length, path[::-1]))
+        return result
+
+def format_path(names, max_items=30):
+    """Join path names with arrows, eliding the middle of very long paths"""
+    names = [str(x) for x in names]
+    if len(names) > max_items:
+        half = max_items // 2
+        names = names[:half] + [f"… ({len(names) - 2 * half} kegiatan) …"] + names[-half:]
+    return ' → '.join(names)
+
+def _add_capacity(G, u, v, capacity):
+    """Add capacity to arc u->v, None meaning infinite"""
+    if G.has_edge(u, v):
+        current = G[u][v].get('capacity')
+        if current is None or capacity is None:
+            G[u][v].pop('capacity', None)
+        else:
+            G[u][v]['capacity'] = current + capacity
+    elif capacity is None:
+        G.add_edge(u, v)
+    else:
+        G.add_edge(u, v, capacity=capacity)
+
+def _min_cut_with_lower_bounds(arcs, source, sink):
+    """Minimum s-t cut where arcs carry lower and upper flow bounds.
+
+    ``arcs`` maps (u, v) to [lower, upper] with upper None for infinite.
+    The cut capacity counts upper bounds of forward arcs minus lower bounds
+    of backward arcs.  A backward arc costs -lower = (upper - lower) counted
+    forward plus lower * (x_u - x_v), so the lower bounds move onto arcs
+    from the source or to the sink and one max-flow finds the cut.
+    Returns the source side of the cut, or raises nx.NetworkXUnbounded if
+    every cut is infinite.
+    """
+    eps = 1e-9
+    G = nx.DiGraph()
+    G.add_nodes_from([source, sink])
+    G.add_edges_from((u, v, {} if upper is None else {'capacity': upper - lower})
+                     for (u, v), (lower, upper) in arcs.items())
+
+    weight = {}
+    for (u, v), (lower, _) in arcs.items():
+        if lower:
+            weight[u] = weight.get(u, 0) + lower
+            weight[v] = weight.get(v, 0) - lower
+    for node, amount in weight.items():
+        if node in (source, sink):
+            continue
+        if amount > eps:
+            _add_capacity(G, node, sink, amount)
+        elif amount < -eps:
+            _add_capacity(G, source, node, -amount)
+
+    _, (reachable, _) = nx.minimum_cut(G, source, sink, flow_func=boykov_kolmogorov)
+    return reachable
+
+def _crash_step(network, d, normal, crash, slope, allow_relax):
+    """Find the cheapest set of activities to shorten (and relax) by one cut"""
+    es, ef, ls, lf = network.solve(d)
+    critical = (ls - es) == 0
+    source, sink = -1, -2
+    project_duration = ef.max()
+
+    arcs = {}
+    for i in np.flatnonzero(critical).tolist():
+        upper = float(slope[i]) if d[i] > crash[i] else None
+        lower = float(slope[i]) if allow_relax and d[i] < normal[i] else 0.0
+        arcs[(2 * i, 2 * i + 1)] = [lower, upper]
+        if es[i] == 0:
+            arcs[(source, 2 * i)] = [0.0, None]
+        if ef[i] == project_duration:
+            arcs[(2 * i + 1, sink)] = [0.0, None]
+
+    # Tight edges join the start (2i) or finish (2i + 1) events of their relation type;
+    # a successor reached at its finish is tied back to its start
+    edge_slack = network.edge_slack(es, ef, d)
+    both = critical[network.src] & critical[network.dst]
+    tight = both & (edge_slack == 0)
+    for p, s, from_finish, to_finish in zip(network.src[tight].tolist(), network.dst[tight].tolist(),
+                                            network.from_finish[tight].tolist(), network.to_finish[tight].tolist()):
+        arcs[(2 * p + int(from_finish), 2 * s + int(to_finish))] = [0.0, None]
+        if to_finish:
+            arcs[(2 * s + 1, 2 * s)] = [0.0, None]
+
+    try:
+        reachable = _min_cut_with_lower_bounds(arcs, source, sink)
+    except nx.NetworkXUnbounded:
+        return None
+
+    idx = np.flatnonzero(critical)
+    start_in = np.array([2 * i in reachable for i in idx.tolist()], dtype=bool)
+    finish_in = np.array([2 * i + 1 in reachable for i in idx.tolist()], dtype=bool)
+    shorten = idx[start_in & ~finish_in]
+    lengthen = idx[~start_in & finish_in]
+    lengthen = lengthen[d[lengthen] < normal[lengthen]]
+    if not shorten.size or np.any(d[shorten] <= crash[shorten]):
+        return None
+
+    # Largest step before another path or edge becomes critical
+    limits = [d[shorten] - crash[shorten], normal[lengthen] - d[lengthen]]
+    slack = ls - es
+    limits.append(slack[slack > 0])
+    gaps = edge_slack[both]
+    limits.append(gaps[gaps > 0])
+    step = min(int(x.min()) for x in limits if x.size)
+
+    return shorten, lengthen, max(1, step)
+
+def _crash_parameters(activities):
+    """Normal and crash durations, cost per day saved and total normal cost"""
+    normal = np.array([a['duration'] for a in activities], dtype=np.int64)
+    crash = np.array([a.get('crash_duration', a['duration']) for a in activities], dtype=np.int64)
+    crash = np.clip(crash, 1, normal)
+    normal_cost = np.array([float(a.get('cost', 0)) for a in activities])
+    crash_cost = np.array([float(a.get('crash_cost', a.get('cost', 0))) for a in activities])
+    reducible = normal - crash
+    slope = np.zeros(len(activities))
+    np.divide(crash_cost - normal_cost, reducible, out=slope, where=reducible > 0)
+    return normal, crash, np.maximum(slope, 0), normal_cost.sum()
+
+def _crash_point(d, project_duration, normal, slope, base_cost):
+    return {
+        'duration': int(project_duration),
+        'cost': float(base_cost + (slope * (normal - d)).sum()),
+        'durations': d.copy()
+    }
+
+def crash_project(activities):
+    """Compute the project time-cost trade-off curve (project crashing).
+
+    Starting from normal durations, every step shortens all critical paths
+    at the lowest cost using a minimum cut over the critical subnetwork
+    (Phillips-Dessouky), relaxing previously crashed activities on backward
+    arcs of the cut where that saves money.  Returns the list of curve
+    points ordered from the normal duration down to the shortest one.
+
+    The cut is exact for finish-to-start networks.  With SS/FF/SF links it
+    is a heuristic, but every step is re-solved so each point is a real
+    schedule.
+    """
+    if not activities:
+        return []
+
+    network = CPMNetwork(activities)
+    normal, crash, slope, base_cost = _crash_parameters(activities)
+
+    def point(d, project_duration):
+        return _crash_point(d, project_duration, normal, slope, base_cost)
+
+    d = normal.copy()
+    project_duration = network.solve(d)[1].max()
+    curve = [point(d, project_duration)]
+
+    while True:
+        accepted = None
+        for allow_relax in (True, False):
+            found = _crash_step(network, d, normal, crash, slope, allow_relax)
+            if found is None:
+                continue
+            shorten, lengthen, step = found
+            for delta in sorted({step, 1}, reverse=True):
+                trial = d.copy()
+                trial[shorten] -= delta
+                trial[lengthen] += delta
+                new_duration = network.solve(trial)[1].max()
+                if new_duration < project_duration:
+                    accepted = (trial, new_duration)
+                    break
+            if accepted:
+                break
+
+        if not accepted:
+            break
+        d, project_duration = accepted
+        curve.append(point(d, project_duration))
+
+    return curve
+
+def select_crash_plan(activities, curve, target):
+    """Pick the cheapest schedule finishing within ``target`` days.
+
+    The curve only holds the points where the cost slope changes.  Between
+    two neighbouring points durations and cost change linearly, so a target
+    falling between them is met part-way along that segment; each
+    part-way schedule is re-solved before it is accepted.
+
+    Returns (point, rows) where rows list the crashed activities, or
+    (None, []) when the target cannot be reached.
+    """
+    feasible = [i for i, p in enumerate(curve) if p['duration'] <= target]
+    if not feasible:
+        return None, []
+    best = min((curve[i] for i in feasible), key=lambda p: (p['cost'], -p['duration']))
+
+    first = feasible[0]
+    if first > 0 and curve[first]['duration'] < target:
+        before, after = curve[first - 1]['durations'], curve[first]['durations']
+        change = after - before
+        network = CPMNetwork(activities)
+        normal, _, slope, base_cost = _crash_parameters(activities)
+        for k in range(1, int(np.abs(change).max())):
+            trial = before + np.sign(change) * np.minimum(k, np.abs(change))
+            project_duration = network.solve(trial)[1].max()
+            if project_duration <= target:
+                point = _crash_point(trial, project_duration, normal, slope, base_cost)
+                if point['cost'] < best['cost']:
+                    best = point
+                break
+
+    rows = []
+    for i, activity in enumerate(activities):
+        crashed = int(best['durations'][i])
+        if crashed < activity['duration']:
+            reduced = activity['duration'] - crashed
+            reducible = activity['duration'] - activity.get('crash_duration', activity['duration'])
+            extra = max(0, activity.get('crash_cost', 0) - activity.get('cost', 0)) / reducible * reduced
+            rows.append({
+                'id': activity['id'],
+                'name': activity['name'],
+                'duration': activity['duration'],
+                'crashed': crashed,
+                'reduced': reduced,
+                'extra_cost': extra
+            })
+    return best, rows
+
+class ProgressTracker:
+    """Actual progress and status-date rescheduling for one project.
+
+    Progress is held in arrays aligned with the CPMNetwork (-1 meaning no
+    actual date).  Finished activities keep their actual dates, started
+    ones continue from the status date with their remaining work, and
+    unstarted ones cannot start before the status date.  Rescheduling
+    after an update only recomputes the forward pass downstream of the
+    updated activities.
+    """
+    def __init__(self, activities):
+        self.network = CPMNetwork(activities)
+        n = len(activities)
+        self.actual_start = np.array([a.get('actual_start') if a.get('actual_start') is not None else -1
+                                      for a in activities], dtype=np.int64)
+        self.actual_finish = np.array([a.get('actual_finish') if a.get('actual_finish') is not None else -1
+                                       for a in activities], dtype=np.int64)
+        self.percent = np.array([float(a.get('percent_complete') or 0) for a in activities])
+        self.weights = np.array([float(a.get('cost', 0)) for a in activities])
+        if not self.weights.sum():
+            self.weights = self.network.durations.astype(float)
+
+        self.baseline_es, self.baseline_ef, _, _ = self.network.solve()
+        self.status_date = 0
+        self.dirty = np.zeros(n, dtype=bool)
+        self.schedule = None
+        self.reschedule(0)
+
+    def update(self, activity_id, actual_start=None, actual_finish=None, percent_complete=0.0):
+        i = self.network.index[activity_id]
+        self.actual_start[i] = -1 if actual_start is None else actual_start
+        self.actual_finish[i] = -1 if actual_finish is None else actual_finish
+        self.percent[i] = 100.0 if actual_finish is not None else percent_complete
+        self.dirty[i] = True
+
+    def _constraints(self, status_date):
+        """Effective durations, ES lower bounds and pinned starts"""
+        d = self.network.durations
+        finished = self.actual_finish >= 0
+        started = (self.actual_start >= 0) & ~finished
+        remaining = np.ceil(d * (1 - self.percent / 100)).astype(np.int64)
+
+        earliest = np.full(len(d), status_date, dtype=np.int64)
+        durations = d.copy()
+        earliest[started] = self.actual_start[started]
+        durations[started] = np.maximum(status_date, self.actual_start[started]) + remaining[started] - self.actual_start[started]
+        finish_start = np.where(self.actual_start >= 0, self.actual_start, self.actual_finish - d)
+        earliest[finished] = np.minimum(finish_start[finished], self.actual_finish[finished])
+        durations[finished] = self.actual_finish[finished] - earliest[finished]
+        return durations, earliest, started | finished
+
+    def reschedule(self, status_date):
+        """Forecast ES/EF/LS/LF as of ``status_date``.
+
+        A new status date moves every unfinished activity; otherwise only
+        activities downstream of updated ones are recomputed.
+        """
+        durations, earliest, fixed = self._constraints(status_date)
+        if self.schedule is None or status_date != self.status_date:
+            affected = None
+        else:
+            affected = self.network.descendants(np.flatnonzero(self.dirty))
+        previous = None if self.schedule is None else self.schedule[:2]
+        self.schedule = self.network.solve(durations, earliest, fixed, previous, affected)
+        self.status_date = status_date
+        self.durations = durations
+        self.dirty[:] = False
+        return self.schedule
+
+    def metrics(self):
+        """Earned-value and slip figures for the current status date"""
+        d = self.network.durations
+        elapsed = (self.status_date - self.baseline_es).astype(float)
+        # Milestones (zero duration) count as planned once their date is reached
+        planned = np.divide(elapsed, d, out=(elapsed >= 0).astype(float), where=d > 0).clip(0, 1)
+        ev = float((self.weights * self.percent / 100).sum())
+        pv = float((self.weights * planned).sum())
+        finish = int(self.schedule[1].max()) if len(d) else 0
+        baseline_finish = int(self.baseline_ef.max()) if len(d) else 0
+        return {
+            'status_date': self.status_date,
+            'earned_value': ev,
+            'planned_value': pv,
+            'spi': ev / pv if pv else 1.0,
+            'percent_complete': float(100 * ev / self.weights.sum()) if self.weights.sum() else 0.0,
+            'finish': finish,
+            'slip': finish - baseline_finish
+        }
+
+    def columns(self):
+        """Current per-activity state as named columns for SnapshotHistory"""
+        return {
+            'percent_complete': self.percent,
+            'actual_start': self.actual_start,
+            'actual_finish': self.actual_finish,
+            'ES': self.schedule[0],
+            'EF': self.schedule[1]
+        }
+
+class SnapshotHistory:
+    """Status snapshots stored as columnar deltas.
+
+    Each snapshot keeps, per column, only the rows that changed since the
+    previous snapshot, with a full keyframe every ``keyframe_every``
+    snapshots so rebuilding one never replays the whole history.  Trend
+    metrics are scalar columns, so charts read them without any replay.
+    """
+    def __init__(self, keyframe_every=13):
+        self.keyframe_every = keyframe_every
+        self.labels = []
+        self.metrics = {}
+        self.deltas = []
+        self.last = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def append(self, label, columns, metrics):
+        keyframe = (self.last is None or len(self.labels) % self.keyframe_every == 0
+                    or any(len(v) != len(self.last[k]) for k, v in columns.items()))
+        delta = {'keyframe': keyframe}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if keyframe:
+                delta[name] = (None, values.copy())
+            else:
+                rows = np.flatnonzero(values != self.last[name]).astype(np.int32)
+                delta[name] = (rows, values[rows])
+        self.deltas.append(delta)
+        self.last = {name: np.asarray(values).copy() for name, values in columns.items()}
+
+        self.labels.append(label)
+        for key, value in metrics.items():
+            self.metrics.setdefault(key, []).append(value)
+
+    def trend(self):
+        """Metric columns as arrays, one value per snapshot"""
+        return {key: np.array(values) for key, values in self.metrics.items()}
+
+    def state(self, position):
+        """Rebuild the per-activity columns of snapshot ``position``"""
+        start = position
+        while not self.deltas[start]['keyframe']:
+            start -= 1
+        columns = {}
+        for delta in self.deltas[start:position + 1]:
+            for name, entry in delta.items():
+                if name == 'keyframe':
+                    continue
+                rows, values = entry
+                if rows is None:
+                    columns[name] = values.copy()
+                else:
+                    columns[name][rows] = values
+        return columns
+
+    def save(self, filename):
+        arrays = {'labels': np.array(self.labels, dtype=str),
+                  'keyframe_every': np.array(self.keyframe_every)}
+        for key, values in self.metrics.items():
+            arrays[f"metric/{key}"] = np.array(values)
+        for i, delta in enumerate(self.deltas):
+            arrays[f"{i}/keyframe"] = np.array(delta['keyframe'])
+            for name, entry in delta.items():
+                if name == 'keyframe':
+                    continue
+                rows, values = entry
+                if rows is not None:
+                    arrays[f"{i}/{name}/rows"] = rows
+                arrays[f"{i}/{name}/values"] = values
+        np.savez_compressed(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            history = cls(int(data['keyframe_every']))
+            history.labels = data['labels'].tolist()
+            history.deltas = [{} for _ in history.labels]
+            rows = {}
+            for key in data.files:
+                parts = key.split('/')
+                if parts[0] == 'metric':
+                    history.metrics[parts[1]] = data[key].tolist()
+                elif len(parts) == 2:
+                    history.deltas[int(parts[0])]['keyframe'] = bool(data[key])
+                elif len(parts) == 3 and parts[2] == 'values':
+                    history.deltas[int(parts[0])][parts[1]] = (None, data[key])
+                elif len(parts) == 3:
+                    rows[(int(parts[0]), parts[1])] = data[key]
+            for (i, name), row_index in rows.items():
+                history.deltas[i][name] = (row_index, history.deltas[i][name][1])
+        if history.labels:
+            history.last = history.state(len(history.labels) - 1)
+        return history
+
+class EditLog:
+    """Undo/redo log for an activity list edited in place.
+
+    Single edits are stored as commands carrying what is needed to invert
+    them (the inserted/deleted activity, old and new field values), so an
+    undo costs the same as the edit.  Bulk edits keep the replaced list
+    itself as a checkpoint instead of copying it.  ``state`` identifies the
+    list contents and returns to its earlier value after an undo, so
+    results cached per state are reused.
+
+    Applying a command returns the change as (kind, position, activity),
+    kind being 'insert', 'delete', 'update' or 'replace' (position and
+    activity None), so views can update only the affected rows.
+    """
+    MISSING = object()
+
+    def __init__(self, activities=None, limit=200):
+        self.activities = activities if activities is not None else []
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+        self.state = 0
+        self.counter = 0
+
+    def _renumber(self, start):
+        for i in range(start, len(self.activities)):
+            self.activities[i]['id'] = i + 1
+
+    def _apply(self, command, inverse=False):
+        kind = command[0]
+        if kind in ('insert', 'delete'):
+            _, position, activity = command[:3]
+            if (kind == 'insert') != inverse:
+                self.activities.insert(position, activity)
+                kind = 'insert'
+            else:
+                del self.activities[position]
+                kind = 'delete'
+            self._renumber(position)
+            return kind, position, activity
+        if kind == 'update':
+            _, position, old, new = command[:4]
+            activity = self.activities[position]
+            for key, value in (old if inverse else new).items():
+                if value is self.MISSING:
+                    activity.pop(key, None)
+                else:
+                    activity[key] = value
+            return kind, position, activity
+        _, old, new = command[:3]
+        self.activities = old if inverse else new
+        return kind, None, None
+
+    def _record(self, *command):
+        self.counter += 1
+        command = command + (self.state, self.counter)
+        change = self._apply(command)
+        self.undo_stack.append(command)
+        self.redo_stack.clear()
+        self.state = self.counter
+        return change
+
+    def insert(self, position, activity):
+        return self._record('insert', position, activity)
+
+    def delete(self, position):
+        return self._record('delete', position, self.activities[position])
+
+    def update(self, position, **fields):
+        activity = self.activities[position]
+        return self._record('update', position, {k: activity.get(k, self.MISSING) for k in fields}, fields)
+
+    def replace(self, activities):
+        """Swap in a new list; the current one is kept as the undo checkpoint"""
+        return self._record('replace', self.activities, activities)
+
+    def undo(self):
+        """Revert the last edit; returns the change or None if there is none"""
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        change = self._apply(command, inverse=True)
+        self.redo_stack.append(command)
+        self.state = command[-2]
+        return change
+
+    def redo(self):
+        """Reapply the last undone edit; returns the change or None"""
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        change = self._apply(command)
+        self.undo_stack.append(command)
+        self.state = command[-1]
+        return change
+
+def parse_activities_frame(df):
+    """Build the activity list from a DataFrame with auto-detected columns.
+
+    Raises ValueError when the name/duration columns cannot be found or
+    when dependency cells are malformed (listing the offending rows).
+    """
+    # Try different column name variations
+    col_mappings = [
+        {'name': ['nama', 'name', 'kegiatan', 'activity', 'task'],
+         'duration': ['durasi', 'duration', 'waktu', 'time'],
+         'deps': ['dependensi', 'dependencies', 'predecessor', 'prasyarat'],
+         'crash_duration': ['durasi crash', 'crash duration', 'waktu crash', 'crash time'],
+         'crash_cost': ['biaya crash', 'crash cost'],
+         'cost': ['biaya', 'cost'],
+         'actual_start': ['mulai aktual', 'actual start'],
+         'actual_finish': ['selesai aktual', 'actual finish'],
+         'percent_complete': ['% selesai', 'percent', 'progress']},
+    ]
+    
+    # Auto-detect columns
+    df.columns = df.columns.str.lower().str.strip()
+    
+    name_col = None
+    duration_col = None
+    deps_col = None
+    crash_duration_col = None
+    crash_cost_col = None
+    cost_col = None
+    progress_cols = {}
+    
+    for col in df.columns:
+        col_clean = col.lower().strip()
+        progress_key = next((k for k in ('actual_start', 'actual_finish', 'percent_complete')
+                             if any(x in col_clean for x in col_mappings[0][k])), None)
+        # Progress/crash/cost columns first: "durasi crash" also contains "durasi"
+        if progress_key:
+            progress_cols[progress_key] = col
+        elif any(x in col_clean for x in col_mappings[0]['crash_duration']):
+            crash_duration_col = col
+        elif any(x in col_clean for x in col_mappings[0]['crash_cost']):
+            crash_cost_col = col
+        elif any(x in col_clean for x in col_mappings[0]['cost']):
+            cost_col = col
+        elif any(x in col_clean for x in col_mappings[0]['name']):
+            name_col = col
+        elif any(x in col_clean for x in col_mappings[0]['duration']):
+            duration_col = col
+        elif any(x in col_clean for x in col_mappings[0]['deps']):
+            deps_col = col
+            
+    # If column names not found, try positional
+    if not name_col and len(df.columns) >= 2:
+        name_col = df.columns[0]
+        duration_col = df.columns[1]
+        if len(df.columns) >= 3:
+            deps_col = df.columns[2]
+            
+    if not name_col or not duration_col:
+        raise ValueError("Tidak dapat mendeteksi kolom nama/durasi!")
+        
+    activities = []
+    bad_rows = []
+    
+    for number, (idx, row) in enumerate(df.iterrows(), start=2):
+        name = str(row[name_col]).strip()
+        if pd.isna(name) or name == '' or name.lower() == 'nan':
+            continue
+            
+        try:
+            duration = int(float(row[duration_col]))
+        except:
+            continue
+            
+        deps = []
+        if deps_col and not pd.isna(row[deps_col]):
+            deps_str = str(row[deps_col]).strip()
+            if deps_str and deps_str.lower() != 'nan':
+                try:
+                    deps = parse_dependencies(deps_str)
+                except ValueError as e:
+                    bad_rows.append(f"baris {number} ({name}): {e}")
+                    
+        crash_duration = duration
+        if crash_duration_col and not pd.isna(row[crash_duration_col]):
+            try:
+                crash_duration = min(duration, max(1, int(float(row[crash_duration_col]))))
+            except:
+                pass
+                
+        cost = 0.0
+        if cost_col and not pd.isna(row[cost_col]):
+            try:
+                cost = max(0.0, float(row[cost_col]))
+            except:
+                pass
+                
+        crash_cost = cost
+        if crash_cost_col and not pd.isna(row[crash_cost_col]):
+            try:
+                crash_cost = max(cost, float(row[crash_cost_col]))
+            except:
+                pass
+                    
+        progress = {'actual_start': None, 'actual_finish': None, 'percent_complete': 0.0}
+        for key, col in progress_cols.items():
+            if pd.isna(row[col]):
+                continue
+            try:
+                progress[key] = float(row[col]) if key == 'percent_complete' else int(float(row[col]))
+            except:
+                pass
+        if progress['actual_finish'] is not None:
+            progress['percent_complete'] = 100.0
+                    
+        activities.append({
+            'id': len(activities) + 1,
+            'name': name,
+            'duration': duration,
+            'dependencies': deps,
+            'crash_duration': crash_duration,
+            'cost': cost,
+            'crash_cost': crash_cost,
+            **progress
+        })
+
+    if bad_rows:
+        lines = bad_rows[:20] + ([f"... dan {len(bad_rows) - 20} baris lainnya"] if len(bad_rows) > 20 else [])
+        raise ValueError("Format dependensi salah (gunakan 1,2,3 atau 3SS+2, 4FF-1):\n" + "\n".join(lines))
+    return activities
+
+def write_excel_report(target, activities, cpm_result, curve=None, target_duration=None, history=None):
+    """Write activities, CPM results, critical paths, crashing and status history sheets.
+
+    ``target`` is a filename or a binary file object.
+    """
+    with pd.ExcelWriter(target, engine='openpyxl') as writer:
+        # Activities sheet
+        activities_df = pd.DataFrame([
+            {
+                'ID': a['id'],
+                'Nama Kegiatan': a['name'],
+                'Durasi': a['duration'],
+                'Dependensi': format_dependencies(a['dependencies']) or '-',
+                'Durasi Crash': a.get('crash_duration', a['duration']),
+                'Biaya Normal': a.get('cost', 0),
+                'Biaya Crash': a.get('crash_cost', a.get('cost', 0)),
+                'Mulai Aktual': a.get('actual_start'),
+                'Selesai Aktual': a.get('actual_finish'),
+                '% Selesai': a.get('percent_complete', 0)
+            }
+            for a in activities
+        ])
+        activities_df.to_excel(writer, sheet_name='Activities', index=False)
+        
+        # CPM Results sheet
+        cpm_df = pd.DataFrame([
+            {
+                'ID': k,
+                'Nama Kegiatan': v['name'],
+                'ES': v['ES'],
+                'EF': v['EF'],
+                'LS': v['LS'],
+                'LF': v['LF'],
+                'Slack': v['slack'],
+                'Jalur Kritis': 'Ya' if v['is_critical'] else 'Tidak',
+                **({
+                    'Mulai': v['start_date'],
+                    'Selesai': v['finish_date'],
+                    'Mulai Terakhir': v['late_start_date'],
+                    'Selesai Terakhir': v['late_finish_date']
+                } if 'start_date' in v else {})
+            }
+            for k, v in cpm_result.items()
+        ])
+        cpm_df.to_excel(writer, sheet_name='CPM Analysis', index=False)
+        
+        # Critical paths sheet
+        index = ScheduleIndex(CPMNetwork(activities))
+        paths_df = pd.DataFrame([
+            {
+                'Jalur': no,
+                'ID Kegiatan': ' → '.join(map(str, path)),
+                'Kegiatan': ' → '.join(cpm_result[aid]['name'] for aid in path)
+            }
+            for no, path in enumerate(index.critical_paths(limit=100), 1)
+        ])
+        paths_df.to_excel(writer, sheet_name='Jalur Kritis', index=False)
+        
+        # Time-cost trade-off sheets
+        if curve and len(curve) > 1:
+            curve_df = pd.DataFrame([
+                {'Durasi Proyek': p['duration'], 'Biaya Langsung': p['cost']}
+                for p in curve
+            ])
+            curve_df.to_excel(writer, sheet_name='Time-Cost Curve', index=False)
+            
+            if target_duration is not None:
+                point, rows = select_crash_plan(activities, curve, target_duration)
+                if point:
+                    plan_df = pd.DataFrame([
+                        {
+                            'ID': r['id'],
+                            'Nama Kegiatan': r['name'],
+                            'Durasi Normal': r['duration'],
+                            'Durasi Crash': r['crashed'],
+                            'Pengurangan': r['reduced'],
+                            'Tambahan Biaya': r['extra_cost']
+                        }
+                        for r in rows
+                    ], columns=['ID', 'Nama Kegiatan', 'Durasi Normal', 'Durasi Crash',
+                                'Pengurangan', 'Tambahan Biaya'])
+                    plan_df.to_excel(writer, sheet_name='Crash Plan', index=False)
+                    
+        # Status history sheet
+        if history is not None and history.labels:
+            trend_df = pd.DataFrame(history.trend())
+            trend_df.insert(0, 'Snapshot', history.labels)
+            trend_df.to_excel(writer, sheet_name='Riwayat Status', index=False)
+
+def parallel_map(func, items, max_workers=None):
+    """Map ``func`` over ``items`` in a process pool (in-process for one item)"""
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    workers = min(len(items), max_workers or os.cpu_count() or 1)
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
+
+def load_project_file(filename):
+    """Read one portfolio project file.
+
+    The first sheet holds the activities.  An optional 'Links' sheet lists
+    cross-project dependencies with columns Proyek (predecessor project),
+    Dari (predecessor activity, same syntax as the dependency column, e.g.
+    "3" or "3SS+2") and Ke (activity ID in this project).
+    Returns (project name, activities, links).
+    """
+    name = os.path.splitext(os.path.basename(filename))[0]
+    sheets = pd.read_excel(filename, sheet_name=None)
+    sheet_names = list(sheets)
+    activities = parse_activities_frame(sheets[sheet_names[0]])
+
+    links = []
+    for sheet_name in sheet_names[1:]:
+        if sheet_name.strip().lower() not in ('links', 'tautan'):
+            continue
+        df = sheets[sheet_name]
+        df.columns = df.columns.str.lower().str.strip()
+        for _, row in df.dropna(subset=['proyek', 'dari', 'ke']).iterrows():
+            deps = parse_dependencies(row['dari'])
+            if len(deps) != 1:
+                raise ValueError(f"Tautan harus berisi satu kegiatan prasyarat: {row['dari']}")
+            pred, kind, lag = deps[0]
+            links.append((str(row['proyek']).strip(), pred, name, int(float(row['ke'])), kind, lag))
+    return name, activities, links
+
+def read_project_file(filename):
+    """load_project_file for a process pool: errors are returned per file"""
+    result = {'file': filename, 'project': None, 'activities': [], 'links': [], 'error': None}
+    try:
+        result['project'], result['activities'], result['links'] = load_project_file(filename)
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    return result
+
+def analyze_project(item):
+    """Standalone CPM summary for one (name, activities) portfolio entry"""
+    name, activities = item
+    summary = {'project': name, 'activities': len(activities), 'duration': None,
+               'critical': 0, 'critical_path': [], 'error': None}
+    try:
+        index = ScheduleIndex(CPMNetwork(activities))
+    except ValueError as e:
+        summary['error'] = str(e)
+        return summary
+    if activities:
+        summary['duration'] = int(index.project_duration)
+        summary['critical'] = int(np.count_nonzero(index.slack == 0))
+        paths = index.critical_paths(limit=1)
+        summary['critical_path'] = paths[0] if paths else []
+    return summary
+
+class Portfolio:
+    """Collection of projects linked by cross-project dependencies.
+
+    Each project keeps its own activity IDs; links are stored as
+    (from project, from ID, to project, to ID, type, lag).  Standalone
+    analysis runs per project in a process pool, the merged analysis runs
+    once over the combined graph.  Both are cached until the projects
+    change.
+    """
+    def __init__(self):
+        self.projects = {}
+        self.sources = {}
+        self.links = []
+        self._summaries = None
+        self._merged = {}
+
+    def load_files(self, filenames, max_workers=None):
+        """Load project files in parallel.
+
+        Projects are named after the file, so reloading a file replaces its
+        project while a different file with the same name is refused.
+        Returns {filename: error} for the files that were not loaded.
+        """
+        errors = {}
+        for result in parallel_map(read_project_file, filenames, max_workers):
+            filename, name = result['file'], result['project']
+            if result['error']:
+                errors[filename] = result['error']
+                continue
+            source = os.path.abspath(filename)
+            if self.sources.get(name, source) != source:
+                errors[filename] = f"Nama proyek '{name}' sudah dipakai oleh {self.sources[name]}"
+                continue
+            self.projects[name] = result['activities']
+            self.sources[name] = source
+            self.links = [l for l in self.links if l[2] != name] + result['links']
+            self._summaries = None
+            self._merged = {}
+        return errors
+
+    def clear(self):
+        self.projects = {}
+        self.sources = {}
+        self.links = []
+        self._summaries = None
+        self._merged = {}
+
+    def analyze(self, max_workers=None):
+        """Standalone CPM summary per project, computed in parallel"""
+        if self._summaries is None:
+            self._summaries = parallel_map(analyze_project, self.projects.items(), max_workers)
+        return self._summaries
+
+    def combined_activities(self):
+        """Merge all projects into one activity list with global IDs.
+
+        Returns (activities, keys) where keys[i] is the (project, local ID)
+        of the i-th combined activity.
+        """
+        global_ids = {}
+        keys = []
+        for project, activities in self.projects.items():
+            for activity in activities:
+                keys.append((project, activity['id']))
+                global_ids[(project, activity['id'])] = len(keys)
+
+        combined = []
+        for project, activities in self.projects.items():
+            for activity in activities:
+                deps = []
+                for pred, kind, lag in normalize_dependencies(activity['dependencies']):
+                    if (project, pred) not in global_ids:
+                        raise ValueError(f"Dependensi {pred} pada {project} kegiatan {activity['id']} tidak ditemukan!")
+                    deps.append((global_ids[(project, pred)], kind, lag))
+                combined.append({
+                    'id': global_ids[(project, activity['id'])],
+                    'name': f"{project}: {activity['name']}",
+                    'duration': activity['duration'],
+                    'dependencies': deps
+                })
+
+        for from_project, from_id, to_project, to_id, kind, lag in self.links:
+            if (from_project, from_id) not in global_ids or (to_project, to_id) not in global_ids:
+                raise ValueError(f"Tautan {from_project}:{from_id} → {to_project}:{to_id} tidak valid!")
+            combined[global_ids[(to_project, to_id)] - 1]['dependencies'].append((global_ids[(from_project, from_id)], kind, lag))
+
+        return combined, keys
+
+    def merged_analysis(self, path_limit=5):
+        """CPM over the combined graph.
+
+        Returns the portfolio duration, each project's finish in the merged
+        schedule and the merged critical paths as (project, ID) lists.
+        Raises ValueError for invalid links or a cycle across projects.
+        """
+        if path_limit not in self._merged:
+            try:
+                self._merged[path_limit] = self._merged_analysis(path_limit)
+            except ValueError as e:
+                self._merged[path_limit] = e
+        result = self._merged[path_limit]
+        if isinstance(result, ValueError):
+            raise result
+        return result
+
+    def _merged_analysis(self, path_limit):
+        combined, keys = self.combined_activities()
+        if not combined:
+            return {'duration': 0, 'finish': {}, 'critical_paths': []}
+        index = ScheduleIndex(CPMNetwork(combined))
+        finish = {}
+        for (project, _), ef in zip(keys, index.ef.tolist()):
+            finish[project] = max(finish.get(project, 0), ef)
+        paths = [[keys[gid - 1] for gid in path] for path in index.critical_paths(limit=path_limit)]
+        return {'duration': int(index.project_duration), 'finish': finish, 'critical_paths': paths}
+
+LARGE_NETWORK = 150
+GANTT_ROWS_PER_PAGE = 40
+CHART_FORMATS = ('png', 'svg', 'pdf')
+
+def network_layout(G, ids, level):
+    """Node positions: spring layout for small networks, topological levels
+    (left to right, ``level`` aligned with ``ids``) for large ones where a
+    spring layout is too slow"""
+    if len(G) <= LARGE_NETWORK:
+        try:
+            return nx.spring_layout(G, k=2, iterations=50, seed=42)
+        except:
+            return nx.shell_layout(G)
+    level = np.asarray(level)
+    order = np.argsort(level, kind='stable')
+    bounds = np.searchsorted(level[order], np.arange(level.max() + 1))
+    rank = np.empty(len(level))
+    rank[order] = np.arange(len(level)) - bounds[level[order]]
+    y = rank - (np.bincount(level)[level] - 1) / 2
+    return dict(zip(list(ids), zip(level.tolist(), (-y).tolist())))
+
+def draw_network(ax, cpm_result, critical_edges, level):
+    """Draw the activity network: critical activities and their tight links
+    (``critical_edges``, ID pairs) in red, other activities in blue, non
+    finish-to-start relations labelled.  ``level`` holds the topological
+    level of each activity in ``cpm_result`` order."""
+    G = nx.DiGraph()
+    
+    # Add nodes
+    for aid, data in cpm_result.items():
+        G.add_node(aid, label=f"{aid}\n{data['name']}\n({data['duration']}d)")
+        
+    # Add edges (relation type and lag kept for labelling)
+    for aid, data in cpm_result.items():
+        for pred, kind, lag in data['dependencies']:
+            G.add_edge(pred, aid, relation=kind + (f"{lag:+d}" if lag else ''))
+            
+    pos = network_layout(G, cpm_result.keys(), level)
+    large = len(G) > LARGE_NETWORK
+    node_size = 300 if large else 3000
+    arrowsize = 8 if large else 20
+    
+    # Draw edges
+    nx.draw_networkx_edges(G, pos, ax=ax, edge_color='#95a5a6', node_size=node_size,
+                          arrows=True, arrowsize=arrowsize, arrowstyle='->')
+    
+    # Draw critical path edges in red (tight edges between critical activities)
+    nx.draw_networkx_edges(G, pos, edgelist=critical_edges, ax=ax, node_size=node_size,
+                          edge_color='#e74c3c', width=1.5 if large else 3,
+                          arrows=True, arrowsize=arrowsize, arrowstyle='->')
+    
+    # Label non finish-to-start relations and lags
+    edge_labels = {(u, v): rel for u, v, rel in G.edges(data='relation') if rel != 'FS'}
+    if edge_labels and not large:
+        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, ax=ax,
+                                    font_size=8, font_color='#2c3e50')
+    
+    # Draw nodes
+    node_colors = ['#e74c3c' if cpm_result[node]['is_critical'] else '#3498db' 
+                  for node in G.nodes()]
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_color=node_colors,
+                          node_size=node_size, alpha=0.9)
+    
+    # Draw labels (IDs only for large networks)
+    labels = {aid: str(aid) if large else f"{aid}\n{data['name'][:15]}\n{data['duration']}d" 
+             for aid, data in cpm_result.items()}
+    nx.draw_networkx_labels(G, pos, labels, ax=ax, font_size=6 if large else 8,
+                           font_weight='bold', font_color='white')
+    ax.axis('off')
+    
+def gantt_extent(rows):
+    """Bar start, finish and late finish (x values) plus a has-dates flag for
+    (id, cpm data) rows; calendar dates when a calendar is set, days otherwise"""
+    has_dates = bool(rows) and 'start_date' in rows[0][1]
+    if has_dates:
+        starts = np.array([d['start_date'] for _, d in rows], dtype='datetime64[D]')
+        finishes = np.array([d['finish_date'] for _, d in rows], dtype='datetime64[D]') + 1
+        late_finishes = np.array([d['late_finish_date'] for _, d in rows], dtype='datetime64[D]') + 1
+        return mdates.date2num(starts), mdates.date2num(finishes), mdates.date2num(late_finishes), True
+    lefts = np.array([d['ES'] for _, d in rows], dtype=float)
+    ends = np.array([d['EF'] for _, d in rows], dtype=float)
+    slack_ends = np.array([d['LF'] for _, d in rows], dtype=float)
+    return lefts, ends, slack_ends, False
+
+def draw_gantt(fig, ax, rows, xlim=None):
+    """Draw Gantt bars for (id, cpm data) rows: critical in red, others in
+    blue, slack in grey.  ``xlim`` keeps the time axis equal across pages."""
+    lefts, ends, slack_ends, has_dates = gantt_extent(rows)
+    critical = np.array([data['is_critical'] for _, data in rows], dtype=bool)
+    slack = np.array([data['slack'] > 0 for _, data in rows], dtype=bool)
+    y_pos = np.arange(len(rows))
+    
+    # Main bars (ES to EF)
+    ax.barh(y_pos, ends - lefts, left=lefts,
+           height=0.6, color=np.where(critical, '#e74c3c', '#3498db'), alpha=0.8,
+           edgecolor='black', linewidth=1.5)
+    
+    # Slack bars
+    ax.barh(y_pos[slack], (slack_ends - ends)[slack], left=ends[slack],
+           height=0.6, color='#95a5a6', alpha=0.3,
+           edgecolor='gray', linewidth=1)
+    
+    # Duration text
+    for idx, (aid, data) in enumerate(rows):
+        ax.text((lefts[idx] + ends[idx]) / 2, idx, f"{data['duration']}d",
+               ha='center', va='center', fontweight='bold',
+               color='white', fontsize=9)
+        
+    # Labels
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels([f"{aid}. {data['name']}" for aid, data in rows], fontsize=9)
+    if xlim is not None:
+        ax.set_xlim(*xlim)
+    if has_dates:
+        ax.xaxis_date()
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%d-%m-%Y'))
+        fig.autofmt_xdate()
+        ax.set_xlabel('Tanggal', fontsize=11, fontweight='bold')
+    else:
+        ax.set_xlabel('Hari', fontsize=11, fontweight='bold')
+        
+    # Grid
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+    ax.set_axisbelow(True)
+    
+def chart_legend(ax, slack=False):
+    """Colour legend drawn into the figure (the GUI uses Tk labels instead)"""
+    handles = [Patch(color='#e74c3c', label='Jalur Kritis'),
+               Patch(color='#3498db', label='Kegiatan Normal')]
+    if slack:
+        handles.append(Patch(color='#95a5a6', alpha=0.3, label='Slack Time'))
+    ax.legend(handles=handles, loc='upper right', fontsize=8)
+    
+def new_figure(figsize):
+    """Figure on the Agg canvas, independent of pyplot and Tk"""
+    fig = Figure(figsize=figsize, facecolor='#ffffff')
+    FigureCanvasAgg(fig)
+    return fig
+
+def render_chart_job(job):
+    """Render one export job (process-pool worker) and return the written files.
+
+    A 'network' job draws the whole project network from the CPM result,
+    critical edges and levels computed by export_charts.  A 'gantt' job draws
+    a run of Gantt pages; each page is rendered once and saved in every
+    requested format, PDF pages going into one multi-page file per job.
+    """
+    base, formats, written = job['base'], job['formats'], []
+    if job['kind'] == 'network':
+        cpm_result, level = job['cpm'], job['level']
+        size = 9 if len(cpm_result) <= LARGE_NETWORK else min(60, 9 + (level.max() + 1) * 0.4)
+        fig = new_figure((size, size * 2 / 3))
+        ax = fig.add_subplot()
+        draw_network(ax, cpm_result, job['critical_edges'], level)
+        chart_legend(ax)
+        fig.suptitle(f"{job['title']} - Network Diagram", fontsize=12, fontweight='bold')
+        fig.tight_layout(rect=[0, 0, 1, 0.95])
+        for fmt in formats:
+            fig.savefig(f"{base}.{fmt}", format=fmt)
+            written.append(f"{base}.{fmt}")
+        return written
+        
+    pdf_name = f"{base}_part{job['part']:02d}.pdf" if job['parts'] > 1 else f"{base}.pdf"
+    pdf = PdfPages(pdf_name) if 'pdf' in formats else None
+    try:
+        for number, rows in job['pages']:
+            fig = new_figure((11, max(4, len(rows) * 0.3 + 2)))
+            ax = fig.add_subplot()
+            draw_gantt(fig, ax, rows, job['xlim'])
+            chart_legend(ax, slack=True)
+            page = f" ({number}/{job['page_count']})" if job['page_count'] > 1 else ''
+            fig.suptitle(f"{job['title']} - Gantt Chart{page}", fontsize=12, fontweight='bold')
+            fig.tight_layout(rect=[0, 0, 1, 0.95])
+            for fmt in formats:
+                if fmt == 'pdf':
+                    pdf.savefig(fig)
+                    continue
+                filename = f"{base}_p{number:03d}.{fmt}" if job['page_count'] > 1 else f"{base}.{fmt}"
+                fig.savefig(filename, format=fmt)
+                written.append(filename)
+    finally:
+        if pdf is not None:
+            pdf.close()
+            written.append(pdf_name)
+    return written
+
+def export_charts(projects, directory, formats=('png',), calendar=None,
+                  rows_per_page=GANTT_ROWS_PER_PAGE, pages_per_job=10, pages_per_pdf=50,
+                  max_workers=None):
+    """Render Gantt and network charts for (name, activities) projects without Tk.
+
+    CPM runs once per project here; the Gantt rows are split into pages
+    and the pages into jobs rendered in a process pool, so both many
+    projects and one huge project use all cores.  A PDF is written by one
+    job, so Gantt charts longer than ``pages_per_pdf`` pages are split
+    into multi-page parts of equal size.
+    Returns (written files, {project: error}); raises ValueError for an
+    unknown format before any rendering starts.
+    """
+    unknown = [fmt for fmt in formats if fmt not in CHART_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"Format grafik tidak dikenal: {', '.join(unknown) or '-'} "
+                         f"(pilihan: {', '.join(CHART_FORMATS)})")
+    os.makedirs(directory, exist_ok=True)
+    jobs, errors = [], {}
+    for name, activities in projects:
+        if not activities:
+            continue
+        try:
+            index = ScheduleIndex(CPMNetwork(activities))
+        except ValueError as e:
+            errors[name] = str(e)
+            continue
+        cpm_result = compute_cpm(activities, calendar, index.network,
+                                 (index.es, index.ef, index.ls, index.lf))
+            
+        base = os.path.join(directory, re.sub(r'[^\w.-]+', '_', name))
+        jobs.append({'kind': 'network', 'base': f"{base}_network", 'title': name,
+                     'formats': formats, 'cpm': cpm_result,
+                     'critical_edges': index.critical_edges(), 'level': index.network.level})
+        
+        rows = sorted(cpm_result.items())
+        lefts, _, slack_ends, _ = gantt_extent(rows)
+        margin = max(1.0, (slack_ends.max() - lefts.min()) * 0.02)
+        xlim = (lefts.min() - margin, slack_ends.max() + margin)
+        pages = [(number + 1, rows[start:start + rows_per_page])
+                 for number, start in enumerate(range(0, len(rows), rows_per_page))]
+        limit = pages_per_pdf if 'pdf' in formats else pages_per_job
+        parts = -(-len(pages) // limit)
+        step = -(-len(pages) // parts)
+        for part, start in enumerate(range(0, len(pages), step)):
+            jobs.append({'kind': 'gantt', 'base': f"{base}_gantt", 'title': name,
+                         'formats': formats, 'pages': pages[start:start + step],
+                         'page_count': len(pages), 'part': part + 1, 'parts': parts,
+                         'xlim': xlim})
+            
+    written = [f for files in parallel_map(render_chart_job, jobs, max_workers) for f in files]
+    return written, errors
+
+def activities_from_json(items):
+    """Validate an activity list posted as JSON.
+
+    Each item needs id, duration and optionally name, dependencies (list
+    of IDs, [ID, type, lag] triples or a "1,3SS+2" string), crash_duration,
+    cost and crash_cost.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("'activities' harus berupa list yang tidak kosong")
+
+    activities = []
+    seen = set()
+    for item in items:
+        try:
+            activity = {
+                'id': int(item['id']),
+                'name': str(item.get('name', item['id'])),
+                'duration': int(item['duration']),
+                'dependencies': normalize_dependencies(item.get('dependencies'))
+            }
+            activity['crash_duration'] = int(item.get('crash_duration', activity['duration']))
+            activity['cost'] = float(item.get('cost', 0))
+            activity['crash_cost'] = float(item.get('crash_cost', activity['cost']))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ValueError(f"Kegiatan tidak valid: {item!r}")
+        if activity['duration'] <= 0 or not 0 < activity['crash_duration'] <= activity['duration']:
+            raise ValueError(f"Durasi kegiatan {activity['id']} tidak valid")
+        if activity['id'] in seen:
+            raise ValueError(f"ID kegiatan {activity['id']} duplikat")
+        seen.add(activity['id'])
+        activities.append(activity)
+    return activities
+
+def calendar_from_json(payload):
+    """WorkCalendar from optional start_date/work_days/holidays fields"""
+    if not payload.get('start_date'):
+        return None
+    return WorkCalendar(payload['start_date'], payload.get('work_days') or '1111100',
+                        payload.get('holidays') or ())
+
+def schedule_to_json(activities, cpm_result, path_limit=20, network=None):
+    """JSON-friendly schedule: per-activity rows plus critical paths"""
+    index = ScheduleIndex(network if network is not None else CPMNetwork(activities))
+    rows = []
+    for aid, data in cpm_result.items():
+        row = {'id': aid, 'name': data['name'], 'duration': data['duration'],
+               'ES': data['ES'], 'EF': data['EF'], 'LS': data['LS'], 'LF': data['LF'],
+               'slack': data['slack'], 'is_critical': data['is_critical']}
+        for key in ('start_date', 'finish_date', 'late_start_date', 'late_finish_date'):
+            if key in data:
+                row[key] = data[key].isoformat()
+        rows.append(row)
+    return {
+        'duration': int(index.project_duration),
+        'activities': rows,
+        'critical_paths': index.critical_paths(limit=path_limit)
+    }
+
+class ServiceMetrics:
+    """Thread-safe request counters and latencies per endpoint"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.in_flight = 0
+        self.rejected = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.endpoints = {}
+
+    def begin(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def end(self, path, seconds, error):
+        with self.lock:
+            self.in_flight -= 1
+            stats = self.endpoints.setdefault(path, {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['count'] += 1
+            stats['errors'] += int(error)
+            stats['total_ms'] += seconds * 1000
+            stats['max_ms'] = max(stats['max_ms'], seconds * 1000)
+
+    def cache(self, hit):
+        with self.lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    def snapshot(self):
+        with self.lock:
+            uptime = time.time() - self.started
+            total = sum(s['count'] for s in self.endpoints.values())
+            return {
+                'uptime_s': round(uptime, 1),
+                'requests': total,
+                'requests_per_s': round(total / uptime, 2) if uptime else 0.0,
+                'in_flight': self.in_flight,
+                'rejected': self.rejected,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'endpoints': {
+                    path: {'count': s['count'], 'errors': s['errors'],
+                           'avg_ms': round(s['total_ms'] / s['count'], 3),
+                           'max_ms': round(s['max_ms'], 3)}
+                    for path, s in self.endpoints.items()
+                }
+            }
+
+class ResultCache:
+    """Bounded LRU cache of responses keyed by a hash of the request"""
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.items = OrderedDict()
+
+    @staticmethod
+    def key(path, payload):
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(f"{path}\n{canonical}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+class SchedulingService:
+    """CPM, what-if and export logic behind JSON endpoints.
+
+    ``dispatch`` maps (method, path, body) to (status, content type, body)
+    and is independent of the HTTP transport.  A request the transport
+    already rejected is passed as ``error`` (status, message) so it gets a
+    JSON answer and is still counted in the metrics.
+    """
+    XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def __init__(self, cache_size=1024):
+        self.cache = ResultCache(cache_size)
+        self.metrics = ServiceMetrics()
+        self.routes = {
+            '/cpm': self.handle_cpm,
+            '/whatif': self.handle_whatif,
+            '/export': self.handle_export
+        }
+
+    def dispatch(self, method, path, body, error=None):
+        started = time.perf_counter()
+        self.metrics.begin()
+        status = 500
+        try:
+            if error is not None:
+                status, content_type, data = self._json(error[0], {'error': error[1]})
+            else:
+                status, content_type, data = self._dispatch(method, path, body)
+            return status, content_type, data
+        finally:
+            known = path in self.routes or path in ('/metrics', '/health')
+            self.metrics.end(path if known else 'other', time.perf_counter() - started, status >= 400)
+
+    def _dispatch(self, method, path, body):
+        if method == 'GET' and path == '/metrics':
+            return self._json(200, self.metrics.snapshot())
+        if method == 'GET' and path == '/health':
+            return self._json(200, {'status': 'ok'})
+        if method != 'POST' or path not in self.routes:
+            return self._json(404, {'error': f"Endpoint {method} {path} tidak ditemukan"})
+
+        try:
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("Body harus berupa objek JSON")
+        except ValueError as e:
+            return self._json(400, {'error': f"JSON tidak valid: {e}"})
+
+        key = self.cache.key(path, payload)
+        cached = self.cache.get(key)
+        self.metrics.cache(cached is not None)
+        if cached is not None:
+            return cached
+
+        try:
+            content_type, data = self.routes[path](payload)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return self._json(400, {'error': str(e) or type(e).__name__})
+        except Exception as e:
+            return self._json(500, {'error': f"Kesalahan internal: {type(e).__name__}"})
+
+        response = (200, content_type, data)
+        self.cache.put(key, response)
+        return response
+
+    @staticmethod
+    def _encode(obj):
+        return 'application/json', json.dumps(obj).encode('utf-8')
+
+    @classmethod
+    def _json(cls, status, obj):
+        return (status,) + cls._encode(obj)
+
+    def _schedule(self, payload):
+        activities = activities_from_json(payload.get('activities'))
+        network = CPMNetwork(activities)
+        cpm_result = compute_cpm(activities, calendar_from_json(payload), network)
+        return activities, cpm_result, network
+
+    @staticmethod
+    def _target(payload):
+        target = payload.get('target')
+        return None if target is None else int(target)
+
+    def handle_cpm(self, payload):
+        activities, cpm_result, network = self._schedule(payload)
+        return self._encode(schedule_to_json(activities, cpm_result, network=network))
+
+    def handle_whatif(self, payload):
+        """Schedule with duration overrides and/or the crash plan for a target"""
+        activities, baseline, _ = self._schedule(payload)
+        target = self._target(payload)
+        overrides = {int(k): int(v) for k, v in (payload.get('durations') or {}).items()}
+        if any(v <= 0 for v in overrides.values()):
+            raise ValueError("Durasi harus berupa angka positif")
+        scenario_activities = [dict(a, duration=overrides.get(a['id'], a['duration']),
+                                    crash_duration=min(a['crash_duration'], overrides.get(a['id'], a['duration'])))
+                               for a in activities]
+        scenario_network = CPMNetwork(scenario_activities)
+        scenario = compute_cpm(scenario_activities, calendar_from_json(payload), scenario_network)
+
+        result = {
+            'baseline_duration': max(v['EF'] for v in baseline.values()),
+            'scenario': schedule_to_json(scenario_activities, scenario, network=scenario_network),
+            'shifted': [
+                {'id': aid, 'ES': scenario[aid]['ES'] - data['ES'], 'EF': scenario[aid]['EF'] - data['EF']}
+                for aid, data in baseline.items()
+                if scenario[aid]['EF'] != data['EF'] or scenario[aid]['ES'] != data['ES']
+            ]
+        }
+
+        if target is not None:
+            curve = crash_project(scenario_activities)
+            point, rows = select_crash_plan(scenario_activities, curve, target)
+            result['crash'] = {
+                'curve': [{'duration': p['duration'], 'cost': p['cost']} for p in curve],
+                'plan': rows,
+                'duration': point['duration'] if point else None,
+                'cost': point['cost'] if point else None
+            }
+        return self._encode(result)
+
+    def handle_export(self, payload):
+        activities, cpm_result, _ = self._schedule(payload)
+        target = self._target(payload)
+        curve = crash_project(activities) if target is not None else None
+        buffer = io.BytesIO()
+        write_excel_report(buffer, activities, cpm_result, curve, target)
+        return self.XLSX, buffer.getvalue()
+
+class SchedulingRequestHandler(BaseHTTPRequestHandler):
+    """One request per connection: a keep-alive client would hold a pool
+    thread while idle, so every response closes its connection"""
+    protocol_version = 'HTTP/1.1'
+    timeout = 5
+    disable_nagle_algorithm = True
+    max_body = 8 * 1024 * 1024
+
+    def do_GET(self):
+        self._respond(b'')
+
+    def do_POST(self):
+        length = self.headers.get('Content-Length')
+        if length is None:
+            return self._respond(b'', (411, "Header Content-Length diperlukan"))
+        try:
+            length = int(length)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            return self._respond(b'', (400, f"Content-Length tidak valid: {length}"))
+        if length > self.max_body:
+            return self._respond(b'', (413, f"Body melebihi batas {self.max_body} byte"))
+        try:
+            body = self.rfile.read(length)
+        except OSError:
+            body = b''
+        if len(body) != length:
+            return self._respond(b'', (400, "Body tidak lengkap"))
+        self._respond(body)
+
+    def _respond(self, body, error=None):
+        status, content_type, data = self.server.service.dispatch(self.command, self.path, body, error)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class SchedulingServer(HTTPServer):
+    """HTTP server handling connections on a bounded thread pool.
+
+    At most ``workers`` connections are served at once and ``backlog``
+    more may wait; beyond that new connections get 503 immediately.
+    """
+    def __init__(self, address, workers=8, backlog=64, cache_size=1024):
+        super().__init__(address, SchedulingRequestHandler)
+        self.service = SchedulingService(cache_size)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.slots = threading.BoundedSemaphore(workers + backlog)
+
+    def process_request(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            self.service.metrics.reject()
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            finally:
+                self.shutdown_request(request)
+            return
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+def serve(host='127.0.0.1', port=8765, workers=8):
+    server = SchedulingServer((host, port), workers=workers)
+    print(f"Scheduling service berjalan di http://{host}:{port} ({workers} worker)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def load_gui_modules():
+    """Import Tk and pyplot for the desktop GUI.
+
+    The service, the chart export and their worker processes never call
+    this, so they run on machines without Tk.
+    """
+    global tk, ttk, messagebox, filedialog, plt, FigureCanvasTkAgg, NavigationToolbar2Tk
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
 class ProjectSchedulingApp:
     def __init__(self, root):
@@ -16,7 +1953,21 @@ class ProjectSchedulingApp:
         self.root.configure(bg="#f0f0f0")
         
         # Data storage
-        self.activities = []
+        self.edits = EditLog()
+        # Results of the last few edit states; one CPM result of a large
+        # project is tens of MB, so only a handful are kept
+        self.results = ResultCache(4)
+        self.crash_executor = ThreadPoolExecutor(max_workers=1)
+        self.crash_jobs = {}
+        self.progress = None
+        self.history = SnapshotHistory()
+        self.portfolio = Portfolio()
+        self.crash_target = tk.StringVar()
+        self.slack_filter = tk.StringVar()
+        self.status_date = tk.StringVar(value='0')
+        self.project_start = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+        self.work_days = tk.StringVar(value='1111100')
+        self.holidays = tk.StringVar()
         
         # Style configuration
         self.setup_styles()
@@ -31,6 +1982,13 @@ class ProjectSchedulingApp:
         self.create_right_panel()
         self.create_footer()
         
+        self.root.bind('<Control-z>', lambda e: self.undo())
+        self.root.bind('<Control-y>', lambda e: self.redo())
+        
+    @property
+    def activities(self):
+        return self.edits.activities
+        
     def setup_styles(self):
         style = ttk.Style()
         style.theme_use('clam')
@@ -82,13 +2040,28 @@ class ProjectSchedulingApp:
         self.activity_duration.grid(row=1, column=1, pady=5, padx=5)
         
         # Dependencies
-        tk.Label(input_frame, text="Dependensi (ex: 1,2,3):", bg="#ffffff", font=('Arial', 10)).grid(row=2, column=0, sticky='w', pady=5)
+        tk.Label(input_frame, text="Dependensi (ex: 1,2,3SS+2):", bg="#ffffff", font=('Arial', 10)).grid(row=2, column=0, sticky='w', pady=5)
         self.activity_deps = tk.Entry(input_frame, width=30, font=('Arial', 10))
         self.activity_deps.grid(row=2, column=1, pady=5, padx=5)
         
+        # Crash duration (optional)
+        tk.Label(input_frame, text="Durasi Crash (opsional):", bg="#ffffff", font=('Arial', 10)).grid(row=3, column=0, sticky='w', pady=5)
+        self.activity_crash_duration = tk.Entry(input_frame, width=30, font=('Arial', 10))
+        self.activity_crash_duration.grid(row=3, column=1, pady=5, padx=5)
+        
+        # Normal cost (optional)
+        tk.Label(input_frame, text="Biaya Normal (opsional):", bg="#ffffff", font=('Arial', 10)).grid(row=4, column=0, sticky='w', pady=5)
+        self.activity_cost = tk.Entry(input_frame, width=30, font=('Arial', 10))
+        self.activity_cost.grid(row=4, column=1, pady=5, padx=5)
+        
+        # Crash cost (optional)
+        tk.Label(input_frame, text="Biaya Crash (opsional):", bg="#ffffff", font=('Arial', 10)).grid(row=5, column=0, sticky='w', pady=5)
+        self.activity_crash_cost = tk.Entry(input_frame, width=30, font=('Arial', 10))
+        self.activity_crash_cost.grid(row=5, column=1, pady=5, padx=5)
+        
         # Buttons
         button_frame = tk.Frame(input_frame, bg="#ffffff")
-        button_frame.grid(row=3, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=6, column=0, columnspan=2, pady=10)
         
         add_btn = tk.Button(button_frame, text="Tambah Kegiatan", 
                            command=self.add_activity,
@@ -104,6 +2077,21 @@ class ProjectSchedulingApp:
                              padx=10, pady=5, cursor="hand2")
         clear_btn.pack(side=tk.LEFT, padx=5)
         
+        # Calendar section
+        calendar_frame = tk.LabelFrame(left_frame, text="Kalender Proyek",
+                                      font=('Arial', 12, 'bold'),
+                                      bg="#ffffff", fg="#2c3e50", padx=10, pady=5)
+        calendar_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        tk.Label(calendar_frame, text="Tanggal Mulai (YYYY-MM-DD):", bg="#ffffff", font=('Arial', 10)).grid(row=0, column=0, sticky='w', pady=2)
+        tk.Entry(calendar_frame, textvariable=self.project_start, width=25, font=('Arial', 10)).grid(row=0, column=1, pady=2, padx=5)
+        
+        tk.Label(calendar_frame, text="Hari Kerja (Sen-Min, ex: 1111100):", bg="#ffffff", font=('Arial', 10)).grid(row=1, column=0, sticky='w', pady=2)
+        tk.Entry(calendar_frame, textvariable=self.work_days, width=25, font=('Arial', 10)).grid(row=1, column=1, pady=2, padx=5)
+        
+        tk.Label(calendar_frame, text="Hari Libur (dipisah koma):", bg="#ffffff", font=('Arial', 10)).grid(row=2, column=0, sticky='w', pady=2)
+        tk.Entry(calendar_frame, textvariable=self.holidays, width=25, font=('Arial', 10)).grid(row=2, column=1, pady=2, padx=5)
+        
         # Import/Export buttons
         io_frame = tk.Frame(left_frame, bg="#ffffff")
         io_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -122,6 +2110,13 @@ class ProjectSchedulingApp:
                               padx=10, pady=5, cursor="hand2")
         export_btn.pack(side=tk.LEFT, padx=5)
         
+        charts_btn = tk.Button(io_frame, text="🖼️ Export Grafik", 
+                              command=self.export_charts,
+                              bg="#16a085", fg="white",
+                              font=('Arial', 10, 'bold'),
+                              padx=10, pady=5, cursor="hand2")
+        charts_btn.pack(side=tk.LEFT, padx=5)
+        
         # Activities table
         table_frame = tk.LabelFrame(left_frame, text="Daftar Kegiatan", 
                                    font=('Arial', 12, 'bold'),
@@ -154,13 +2149,30 @@ class ProjectSchedulingApp:
         self.tree.heading('Durasi', text='Durasi', anchor=tk.CENTER)
         self.tree.heading('Dependensi', text='Dependensi', anchor=tk.CENTER)
         
-        # Delete button
-        delete_btn = tk.Button(left_frame, text="🗑️ Hapus Kegiatan Terpilih", 
+        # Delete and undo/redo buttons
+        edit_frame = tk.Frame(left_frame, bg="#ffffff")
+        edit_frame.pack(pady=5)
+        
+        delete_btn = tk.Button(edit_frame, text="🗑️ Hapus Kegiatan Terpilih", 
                               command=self.delete_activity,
                               bg="#e67e22", fg="white",
                               font=('Arial', 10, 'bold'),
                               padx=10, pady=5, cursor="hand2")
-        delete_btn.pack(pady=5)
+        delete_btn.pack(side=tk.LEFT, padx=5)
+        
+        undo_btn = tk.Button(edit_frame, text="↩️ Undo", 
+                            command=self.undo,
+                            bg="#7f8c8d", fg="white",
+                            font=('Arial', 10, 'bold'),
+                            padx=10, pady=5, cursor="hand2")
+        undo_btn.pack(side=tk.LEFT, padx=5)
+        
+        redo_btn = tk.Button(edit_frame, text="↪️ Redo", 
+                            command=self.redo,
+                            bg="#7f8c8d", fg="white",
+                            font=('Arial', 10, 'bold'),
+                            padx=10, pady=5, cursor="hand2")
+        redo_btn.pack(side=tk.LEFT, padx=5)
         
     def create_right_panel(self):
         right_frame = tk.Frame(self.main_frame, bg="#ffffff", relief=tk.RAISED, bd=2)
@@ -182,8 +2194,16 @@ class ProjectSchedulingApp:
         self.gantt_frame = tk.Frame(self.notebook, bg="#ffffff")
         self.notebook.add(self.gantt_frame, text="📅 Gantt Chart")
         
+        # Portfolio Tab
+        self.portfolio_frame = tk.Frame(self.notebook, bg="#ffffff")
+        self.notebook.add(self.portfolio_frame, text="📁 Portfolio")
+        
+        # Progress Tab
+        self.progress_frame = tk.Frame(self.notebook, bg="#ffffff")
+        self.notebook.add(self.progress_frame, text="📈 Progress")
+        
         # Add scrollbar to each tab
-        for frame in [self.cpm_frame, self.network_frame, self.gantt_frame]:
+        for frame in [self.cpm_frame, self.network_frame, self.gantt_frame, self.portfolio_frame, self.progress_frame]:
             canvas = tk.Canvas(frame, bg="#ffffff")
             scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
             scrollable_frame = tk.Frame(canvas, bg="#ffffff")
@@ -236,27 +2256,55 @@ class ProjectSchedulingApp:
         dep_list = []
         if deps:
             try:
-                dep_list = [int(x.strip()) for x in deps.split(',') if x.strip()]
-            except:
-                messagebox.showwarning("Input Error", "Format dependensi salah! Gunakan: 1,2,3")
+                dep_list = parse_dependencies(deps)
+            except ValueError:
+                messagebox.showwarning("Input Error", "Format dependensi salah! Gunakan: 1,2,3 atau 3SS+2, 4FF-1")
                 return
                 
+        # Process crash data
+        crash_duration = self.activity_crash_duration.get().strip()
+        cost = self.activity_cost.get().strip()
+        crash_cost = self.activity_crash_cost.get().strip()
+        try:
+            crash_duration = int(crash_duration) if crash_duration else duration
+            if crash_duration <= 0 or crash_duration > duration:
+                raise ValueError()
+        except:
+            messagebox.showwarning("Input Error", "Durasi crash harus angka positif dan tidak melebihi durasi!")
+            return
+            
+        try:
+            cost = float(cost) if cost else 0.0
+            crash_cost = float(crash_cost) if crash_cost else cost
+            if cost < 0 or crash_cost < cost:
+                raise ValueError()
+        except:
+            messagebox.showwarning("Input Error", "Biaya harus angka positif dan biaya crash tidak boleh lebih kecil dari biaya normal!")
+            return
+                
         activity_id = len(self.activities) + 1
-        self.activities.append({
+        change = self.edits.insert(len(self.activities), {
             'id': activity_id,
             'name': name,
             'duration': duration,
-            'dependencies': dep_list
+            'dependencies': dep_list,
+            'crash_duration': crash_duration,
+            'cost': cost,
+            'crash_cost': crash_cost,
+            'actual_start': None,
+            'actual_finish': None,
+            'percent_complete': 0.0
         })
-        
-        # Add to tree
-        dep_str = ','.join(map(str, dep_list)) if dep_list else '-'
-        self.tree.insert('', tk.END, values=(activity_id, name, duration, dep_str))
+        self.activities_changed()
+        self.update_tree(change)
         
         # Clear inputs
         self.activity_name.delete(0, tk.END)
         self.activity_duration.delete(0, tk.END)
         self.activity_deps.delete(0, tk.END)
+        self.activity_crash_duration.delete(0, tk.END)
+        self.activity_cost.delete(0, tk.END)
+        self.activity_crash_cost.delete(0, tk.END)
         
     def delete_activity(self):
         selected = self.tree.selection()
@@ -267,32 +2315,82 @@ class ProjectSchedulingApp:
         item = self.tree.item(selected[0])
         activity_id = item['values'][0]
         
-        # Remove from activities list
-        self.activities = [a for a in self.activities if a['id'] != activity_id]
+        # Remove from activities list (re-indexes the following activities)
+        change = self.edits.delete(activity_id - 1)
+        self.activities_changed()
+        self.update_tree(change)
         
-        # Re-index activities
-        for idx, activity in enumerate(self.activities):
-            activity['id'] = idx + 1
+    def activities_changed(self):
+        """Drop results derived from the activity list after an edit.
+
+        CPM and crashing results are cached per edit state, so they need no
+        invalidation and are reused when an undo returns to a known state.
+        """
+        self.progress = None
+        
+    def undo(self):
+        change = self.edits.undo()
+        if change:
+            self.activities_changed()
+            self.update_tree(change)
+            
+    def redo(self):
+        change = self.edits.redo()
+        if change:
+            self.activities_changed()
+            self.update_tree(change)
             
-        # Refresh tree
-        self.refresh_tree()
+    def state_results(self, state=None):
+        """Results cached for an edit state (the current one by default)"""
+        state = self.edits.state if state is None else state
+        results = self.results.get(state)
+        if results is None:
+            results = {}
+            self.results.put(state, results)
+        return results
+        
+    @staticmethod
+    def tree_iid(activity):
+        # Rows are keyed by the activity object so an edit finds its row directly
+        return f"a{id(activity)}"
+        
+    @staticmethod
+    def tree_values(activity):
+        return (
+            activity['id'],
+            activity['name'],
+            activity['duration'],
+            format_dependencies(activity['dependencies']) or '-'
+        )
         
-    def refresh_tree(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def update_tree(self, change):
+        """Apply an EditLog change to the affected Treeview rows only"""
+        kind, position, activity = change
+        if kind == 'replace':
+            self.refresh_tree()
+            return
+        if kind == 'update':
+            self.tree.item(self.tree_iid(activity), values=self.tree_values(activity))
+            return
+        if kind == 'insert':
+            self.tree.insert('', position, iid=self.tree_iid(activity), values=self.tree_values(activity))
+            position += 1
+        else:
+            self.tree.delete(self.tree_iid(activity))
+            
+        # IDs are positional: rows after the edit were re-numbered
+        for following in self.activities[position:]:
+            self.tree.set(self.tree_iid(following), 'ID', following['id'])
             
+    def refresh_tree(self):
+        self.tree.delete(*self.tree.get_children())
         for activity in self.activities:
-            dep_str = ','.join(map(str, activity['dependencies'])) if activity['dependencies'] else '-'
-            self.tree.insert('', tk.END, values=(
-                activity['id'],
-                activity['name'],
-                activity['duration'],
-                dep_str
-            ))
+            self.tree.insert('', tk.END, iid=self.tree_iid(activity), values=self.tree_values(activity))
             
     def clear_all(self):
         if messagebox.askyesno("Konfirmasi", "Hapus semua kegiatan?"):
-            self.activities = []
+            self.edits.replace([])
+            self.activities_changed()
             self.refresh_tree()
             
     def import_excel(self):
@@ -306,69 +2404,8 @@ class ProjectSchedulingApp:
             
         try:
             df = pd.read_excel(filename)
-            
-            # Try different column name variations
-            col_mappings = [
-                {'name': ['nama', 'name', 'kegiatan', 'activity', 'task'],
-                 'duration': ['durasi', 'duration', 'waktu', 'time'],
-                 'deps': ['dependensi', 'dependencies', 'predecessor', 'prasyarat']},
-            ]
-            
-            # Auto-detect columns
-            df.columns = df.columns.str.lower().str.strip()
-            
-            name_col = None
-            duration_col = None
-            deps_col = None
-            
-            for col in df.columns:
-                col_clean = col.lower().strip()
-                if any(x in col_clean for x in col_mappings[0]['name']):
-                    name_col = col
-                elif any(x in col_clean for x in col_mappings[0]['duration']):
-                    duration_col = col
-                elif any(x in col_clean for x in col_mappings[0]['deps']):
-                    deps_col = col
-                    
-            # If column names not found, try positional
-            if not name_col and len(df.columns) >= 2:
-                name_col = df.columns[0]
-                duration_col = df.columns[1]
-                if len(df.columns) >= 3:
-                    deps_col = df.columns[2]
-                    
-            if not name_col or not duration_col:
-                messagebox.showerror("Error", "Tidak dapat mendeteksi kolom nama/durasi!")
-                return
-                
-            self.activities = []
-            
-            for idx, row in df.iterrows():
-                name = str(row[name_col]).strip()
-                if pd.isna(name) or name == '' or name.lower() == 'nan':
-                    continue
-                    
-                try:
-                    duration = int(float(row[duration_col]))
-                except:
-                    continue
-                    
-                deps = []
-                if deps_col and not pd.isna(row[deps_col]):
-                    deps_str = str(row[deps_col]).strip()
-                    if deps_str and deps_str.lower() != 'nan':
-                        try:
-                            deps = [int(float(x.strip())) for x in deps_str.split(',') if x.strip()]
-                        except:
-                            pass
-                            
-                self.activities.append({
-                    'id': len(self.activities) + 1,
-                    'name': name,
-                    'duration': duration,
-                    'dependencies': deps
-                })
-                
+            self.edits.replace(parse_activities_frame(df))
+            self.activities_changed()
             self.refresh_tree()
             messagebox.showinfo("Success", f"Berhasil mengimpor {len(self.activities)} kegiatan!")
             
@@ -386,6 +2423,15 @@ class ProjectSchedulingApp:
             messagebox.showwarning("Warning", "Gagal menghitung CPM!")
             return
             
+        # Crashing runs in the worker started by "Hitung", never on the export path
+        curve = self.get_crash_curve()
+        if curve is None and self.get_crash_target() is not None and self.can_crash():
+            if not messagebox.askyesno("Konfirmasi",
+                                       "Kurva waktu-biaya belum dihitung. Ekspor tanpa sheet crashing?\n"
+                                       "(Pilih No untuk mulai menghitung, lalu ekspor lagi setelah selesai.)"):
+                self.start_crash_curve()
+                return
+                
         filename = filedialog.asksaveasfilename(
             title="Simpan File Excel",
             defaultextension=".xlsx",
@@ -396,111 +2442,110 @@ class ProjectSchedulingApp:
             return
             
         try:
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                # Activities sheet
-                activities_df = pd.DataFrame([
-                    {
-                        'ID': a['id'],
-                        'Nama Kegiatan': a['name'],
-                        'Durasi': a['duration'],
-                        'Dependensi': ','.join(map(str, a['dependencies'])) if a['dependencies'] else '-'
-                    }
-                    for a in self.activities
-                ])
-                activities_df.to_excel(writer, sheet_name='Activities', index=False)
-                
-                # CPM Results sheet
-                cpm_df = pd.DataFrame([
-                    {
-                        'ID': k,
-                        'Nama Kegiatan': v['name'],
-                        'ES': v['ES'],
-                        'EF': v['EF'],
-                        'LS': v['LS'],
-                        'LF': v['LF'],
-                        'Slack': v['slack'],
-                        'Jalur Kritis': 'Ya' if v['is_critical'] else 'Tidak'
-                    }
-                    for k, v in cpm_result.items()
-                ])
-                cpm_df.to_excel(writer, sheet_name='CPM Analysis', index=False)
-                
+            write_excel_report(filename, self.activities, cpm_result, curve,
+                               self.get_crash_target(), self.history)
             messagebox.showinfo("Success", "Data berhasil diekspor ke Excel!")
             
         except Exception as e:
             messagebox.showerror("Error", f"Gagal mengekspor file: {str(e)}")
             
+    def export_charts(self):
+        if not self.activities:
+            messagebox.showwarning("Warning", "Tidak ada data untuk diekspor!")
+            return
+            
+        directory = filedialog.askdirectory(title="Pilih Folder Grafik")
+        if not directory:
+            return
+            
+        projects = [("project", self.activities)] + list(self.portfolio.projects.items())
+        try:
+            written, errors = export_charts(projects, directory, ('png', 'svg', 'pdf'), self.get_calendar())
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal mengekspor grafik: {str(e)}")
+            return
+        if errors:
+            messagebox.showwarning("Warning", "\n".join(f"{name}: {error}" for name, error in errors.items()))
+        messagebox.showinfo("Success", f"{len(written)} file grafik berhasil diekspor!")
+        
     def calculate_cpm(self):
         if not self.activities:
             return None
             
-        # Build activity dictionary
-        act_dict = {a['id']: a for a in self.activities}
-        
-        # Calculate ES and EF (Forward pass)
-        es = {a['id']: 0 for a in self.activities}
-        ef = {}
-        
-        # Topological sort using Kahn's algorithm
-        in_degree = {a['id']: len(a['dependencies']) for a in self.activities}
-        queue = deque([a['id'] for a in self.activities if not a['dependencies']])
-        
-        processed = []
-        while queue:
-            current = queue.popleft()
-            processed.append(current)
-            
-            # Calculate ES and EF
-            if act_dict[current]['dependencies']:
-                es[current] = max(ef[pred] for pred in act_dict[current]['dependencies'])
-            ef[current] = es[current] + act_dict[current]['duration']
-            
-            # Update successors
-            for activity in self.activities:
-                if current in activity['dependencies']:
-                    in_degree[activity['id']] -= 1
-                    if in_degree[activity['id']] == 0:
-                        queue.append(activity['id'])
-                        
-        if len(processed) != len(self.activities):
-            messagebox.showerror("Error", "Terdapat circular dependency!")
+        # One CPM result per state, for the calendar inputs it was computed with
+        results = self.state_results()
+        calendar_key = (self.project_start.get().strip(), self.work_days.get().strip(),
+                        self.holidays.get().strip())
+        if results.get('cpm', (None,))[0] != calendar_key:
+            try:
+                results['cpm'] = (calendar_key, compute_cpm(self.activities, self.get_calendar()))
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return None
+        return results['cpm'][1]
+            
+    def get_calendar(self):
+        """Working calendar from the calendar inputs, None if no start date"""
+        start = self.project_start.get().strip()
+        if not start:
             return None
             
-        # Calculate LS and LF (Backward pass)
-        project_duration = max(ef.values())
-        lf = {a['id']: project_duration for a in self.activities if not any(a['id'] in act['dependencies'] for act in self.activities)}
-        ls = {}
-        
-        # Process in reverse topological order
-        for current in reversed(processed):
-            if current not in lf:
-                successors = [a['id'] for a in self.activities if current in a['dependencies']]
-                if successors:
-                    lf[current] = min(ls[succ] for succ in successors)
-                else:
-                    lf[current] = project_duration
-                    
-            ls[current] = lf[current] - act_dict[current]['duration']
+        try:
+            start = datetime.strptime(start, '%Y-%m-%d').date()
+            weekmask = self.work_days.get().strip() or '1111100'
+            holidays = [datetime.strptime(x.strip(), '%Y-%m-%d').date()
+                        for x in self.holidays.get().split(',') if x.strip()]
+            return WorkCalendar(start, weekmask, holidays)
+        except ValueError:
+            messagebox.showwarning("Input Error", "Format kalender salah! Tanggal: YYYY-MM-DD, Hari Kerja: 1111100")
+            return None
             
-        # Calculate slack and identify critical path
-        result = {}
-        for activity in self.activities:
-            aid = activity['id']
-            slack = ls[aid] - es[aid]
-            result[aid] = {
-                'name': activity['name'],
-                'duration': activity['duration'],
-                'ES': es[aid],
-                'EF': ef[aid],
-                'LS': ls[aid],
-                'LF': lf[aid],
-                'slack': slack,
-                'is_critical': slack == 0,
-                'dependencies': activity['dependencies']
-            }
+    def get_crash_curve(self):
+        """Time-cost curve for the current edit state, None until the worker
+        started by start_crash_curve has finished"""
+        return self.state_results().get('crash')
+        
+    def can_crash(self):
+        return any(a.get('crash_duration', a['duration']) < a['duration'] for a in self.activities)
+        
+    def start_crash_curve(self):
+        """Compute the time-cost curve in a worker thread, then redraw the CPM tab"""
+        state = self.edits.state
+        if (self.can_crash() and state not in self.crash_jobs
+                and 'crash' not in self.state_results()):
+            # Edits change the activity dicts in place, so the worker gets its own copies
+            snapshot = [dict(a, dependencies=list(a['dependencies'])) for a in self.activities]
+            self.crash_jobs[state] = self.crash_executor.submit(crash_project, snapshot)
+            self.root.after(200, self.poll_crash_curve)
+        self.show_cpm_results()
+        
+    def poll_crash_curve(self):
+        for state, job in list(self.crash_jobs.items()):
+            if not job.done():
+                continue
+            del self.crash_jobs[state]
+            try:
+                self.state_results(state)['crash'] = job.result()
+            except ValueError:
+                self.state_results(state)['crash'] = []
+            if state == self.edits.state:
+                self.show_cpm_results()
+        if self.crash_jobs:
+            self.root.after(200, self.poll_crash_curve)
+        
+    def get_schedule_index(self):
+        """ScheduleIndex for the current activities, computed once per edit state"""
+        results = self.state_results()
+        if 'index' not in results:
+            results['index'] = ScheduleIndex(CPMNetwork(self.activities))
+        return results['index']
+        
+    def get_crash_target(self):
+        try:
+            return int(self.crash_target.get().strip())
+        except ValueError:
+            return None
             
-        return result
-        
     def show_cpm_results(self):
         # Clear previous content
         for widget in self.cpm_frame.scrollable_frame.winfo_children():
@@ -518,36 +2563,68 @@ class ProjectSchedulingApp:
         title.pack(pady=10)
         
         # Project duration
+        duration_text = f"Total Durasi Proyek: {max(v['EF'] for v in cpm_result.values())} hari"
+        has_dates = 'start_date' in next(iter(cpm_result.values()))
+        if has_dates:
+            start = min(v['start_date'] for v in cpm_result.values())
+            finish = max(v['finish_date'] for v in cpm_result.values())
+            duration_text += f" kerja ({start:%Y-%m-%d} s/d {finish:%Y-%m-%d})"
         duration_label = tk.Label(self.cpm_frame.scrollable_frame,
-                                 text=f"Total Durasi Proyek: {max(v['EF'] for v in cpm_result.values())} hari",
+                                 text=duration_text,
                                  font=('Arial', 12, 'bold'),
                                  bg="#ffffff", fg="#27ae60")
         duration_label.pack(pady=5)
         
-        # Critical path
-        critical_activities = [v['name'] for v in cpm_result.values() if v['is_critical']]
+        # Critical paths (actual chains through tight edges)
+        index = self.get_schedule_index()
+        path_limit = 10
+        paths = index.critical_paths(limit=path_limit + 1)
+        path_lines = [f"Jalur Kritis {no}: {format_path(cpm_result[aid]['name'] for aid in path)}"
+                      for no, path in enumerate(paths[:path_limit], 1)]
+        if len(paths) > path_limit:
+            path_lines.append(f"(lebih dari {path_limit} jalur kritis, hanya {path_limit} yang ditampilkan)")
         critical_label = tk.Label(self.cpm_frame.scrollable_frame,
-                                 text=f"Jalur Kritis: {' → '.join(critical_activities)}",
+                                 text='\n'.join(path_lines),
                                  font=('Arial', 11),
                                  bg="#ffffff", fg="#e74c3c",
-                                 wraplength=800)
+                                 wraplength=800, justify=tk.LEFT)
         critical_label.pack(pady=5)
         
+        # Longest paths (critical and near-critical chains)
+        longest_lines = [f"{no}. {length} hari: {format_path(cpm_result[aid]['name'] for aid in path)}"
+                         for no, (length, path) in enumerate(index.longest_paths(k=5), 1)]
+        longest_label = tk.Label(self.cpm_frame.scrollable_frame,
+                                text="5 Jalur Terpanjang:\n" + '\n'.join(longest_lines),
+                                font=('Arial', 10),
+                                bg="#ffffff", fg="#2c3e50",
+                                wraplength=800, justify=tk.LEFT)
+        longest_label.pack(pady=5)
+        
+        # Slack filter
+        filter_frame = tk.Frame(self.cpm_frame.scrollable_frame, bg="#ffffff")
+        filter_frame.pack(pady=5)
+        
+        tk.Label(filter_frame, text="Tampilkan Slack ≤", bg="#ffffff", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        slack_entry = tk.Entry(filter_frame, textvariable=self.slack_filter, width=8, font=('Arial', 10))
+        slack_entry.pack(side=tk.LEFT, padx=5)
+        
         # Results table
         table_frame = tk.Frame(self.cpm_frame.scrollable_frame, bg="#ffffff")
         table_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
         
         # Create treeview
         columns = ('ID', 'Kegiatan', 'Durasi', 'ES', 'EF', 'LS', 'LF', 'Slack', 'Kritis')
+        if has_dates:
+            columns += ('Mulai', 'Selesai')
         tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
         
         # Column headings
         for col in columns:
             tree.heading(col, text=col)
-            tree.column(col, width=100 if col == 'Kegiatan' else 70, anchor=tk.CENTER)
+            tree.column(col, width=100 if col in ('Kegiatan', 'Mulai', 'Selesai') else 70, anchor=tk.CENTER)
             
         # Add data
-        for aid, data in sorted(cpm_result.items()):
+        def insert_row(aid, data):
             values = (
                 aid,
                 data['name'],
@@ -559,10 +2636,28 @@ class ProjectSchedulingApp:
                 data['slack'],
                 '✓' if data['is_critical'] else ''
             )
+            if has_dates:
+                values += (f"{data['start_date']:%Y-%m-%d}", f"{data['finish_date']:%Y-%m-%d}")
             
             tag = 'critical' if data['is_critical'] else 'normal'
             tree.insert('', tk.END, values=values, tags=(tag,))
             
+        def fill_table():
+            tree.delete(*tree.get_children())
+            try:
+                max_slack = int(self.slack_filter.get().strip())
+                shown = sorted(index.within_slack(max_slack).tolist())
+            except ValueError:
+                shown = sorted(cpm_result)
+            for aid in shown:
+                insert_row(aid, cpm_result[aid])
+            
+        fill_table()
+        tk.Button(filter_frame, text="Filter", command=fill_table,
+                  bg="#3498db", fg="white", font=('Arial', 10, 'bold'),
+                  padx=10, cursor="hand2").pack(side=tk.LEFT, padx=5)
+        slack_entry.bind('<Return>', lambda e: fill_table())
+            
         # Tag configuration
         tree.tag_configure('critical', background='#ffcccc')
         tree.tag_configure('normal', background='#ffffff')
@@ -573,6 +2668,93 @@ class ProjectSchedulingApp:
         
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Time-cost trade-off
+        self.show_crash_results(self.cpm_frame.scrollable_frame)
+        
+    def show_crash_results(self, parent):
+        crash_frame = tk.LabelFrame(parent, text="Time-Cost Trade-off (Crashing)",
+                                   font=('Arial', 12, 'bold'),
+                                   bg="#ffffff", fg="#2c3e50", padx=10, pady=10)
+        crash_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+        
+        # Target input
+        target_frame = tk.Frame(crash_frame, bg="#ffffff")
+        target_frame.pack(side=tk.TOP, pady=5)
+        
+        tk.Label(target_frame, text="Target Durasi (hari):", bg="#ffffff", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        target_entry = tk.Entry(target_frame, textvariable=self.crash_target, width=10, font=('Arial', 10))
+        target_entry.pack(side=tk.LEFT, padx=5)
+        target_entry.bind('<Return>', lambda e: self.start_crash_curve())
+        tk.Button(target_frame, text="Hitung", command=self.start_crash_curve,
+                  bg="#27ae60", fg="white", font=('Arial', 10, 'bold'),
+                  padx=10, cursor="hand2").pack(side=tk.LEFT, padx=5)
+        
+        # The curve is computed on request in a worker thread, never while drawing the tab
+        curve = self.get_crash_curve()
+        if curve is None and self.can_crash():
+            text = ("Menghitung kurva waktu-biaya..." if self.edits.state in self.crash_jobs
+                    else "Isi Target Durasi lalu klik Hitung untuk menghitung kurva waktu-biaya.")
+            tk.Label(crash_frame, text=text,
+                     font=('Arial', 10), bg="#ffffff", fg="#7f8c8d").pack(pady=5)
+            return
+        if not curve or len(curve) < 2:
+            tk.Label(crash_frame,
+                     text="Tidak ada kegiatan kritis yang dapat di-crash (isi Durasi Crash dan Biaya).",
+                     font=('Arial', 10), bg="#ffffff", fg="#7f8c8d").pack(pady=5)
+            return
+            
+        normal, fastest = curve[0], curve[-1]
+        tk.Label(crash_frame,
+                 text=f"Normal: {normal['duration']} hari (biaya {normal['cost']:,.0f}) | "
+                      f"Tercepat: {fastest['duration']} hari (biaya {fastest['cost']:,.0f})",
+                 font=('Arial', 10, 'bold'), bg="#ffffff", fg="#2c3e50").pack(pady=5)
+        
+        target = self.get_crash_target()
+        point, rows = select_crash_plan(self.activities, curve, target) if target is not None else (None, [])
+        
+        # Curve chart
+        fig, ax = plt.subplots(figsize=(7, 3.5))
+        fig.patch.set_facecolor('#ffffff')
+        ax.plot([p['duration'] for p in curve], [p['cost'] for p in curve],
+                marker='o', color='#3498db', linewidth=2)
+        if point:
+            ax.plot(point['duration'], point['cost'], marker='o', markersize=12, color='#e74c3c')
+        ax.set_xlabel('Durasi Proyek (hari)', fontsize=10, fontweight='bold')
+        ax.set_ylabel('Biaya Langsung', fontsize=10, fontweight='bold')
+        ax.set_title('Kurva Waktu-Biaya', fontsize=11, fontweight='bold')
+        ax.grid(alpha=0.3, linestyle='--')
+        plt.tight_layout()
+        
+        canvas = FigureCanvasTkAgg(fig, master=crash_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=5)
+        plt.close(fig)
+        
+        if target is None:
+            return
+        if not point:
+            tk.Label(crash_frame,
+                     text=f"Target {target} hari tidak dapat dicapai (minimal {fastest['duration']} hari).",
+                     font=('Arial', 10), bg="#ffffff", fg="#e74c3c").pack(pady=5)
+            return
+            
+        tk.Label(crash_frame,
+                 text=f"Rencana Crashing: {point['duration']} hari, total biaya {point['cost']:,.0f} "
+                      f"(tambahan {point['cost'] - normal['cost']:,.0f})",
+                 font=('Arial', 10, 'bold'), bg="#ffffff", fg="#e74c3c").pack(pady=5)
+        
+        columns = ('ID', 'Kegiatan', 'Normal', 'Crash', 'Pengurangan', 'Tambahan Biaya')
+        plan_tree = ttk.Treeview(crash_frame, columns=columns, show='headings',
+                                 height=min(10, max(1, len(rows))))
+        for col in columns:
+            plan_tree.heading(col, text=col)
+            plan_tree.column(col, width=120 if col in ('Kegiatan', 'Tambahan Biaya') else 80, anchor=tk.CENTER)
+        for r in rows:
+            plan_tree.insert('', tk.END, values=(
+                r['id'], r['name'], r['duration'], r['crashed'], r['reduced'], f"{r['extra_cost']:,.0f}"
+            ))
+        plan_tree.pack(fill=tk.X, pady=5)
     
     def zoom_factory(self, ax, base_scale=1.5):
         """Enable zoom with mouse wheel"""
@@ -660,56 +2842,12 @@ class ProjectSchedulingApp:
         fig, ax = plt.subplots(figsize=(9, 6))
         fig.patch.set_facecolor('#ffffff')
         
-        # Create directed graph
-        G = nx.DiGraph()
-        
-        # Add nodes
-        for aid, data in cpm_result.items():
-            G.add_node(aid, label=f"{aid}\n{data['name']}\n({data['duration']}d)")
-            
-        # Add edges
-        for aid, data in cpm_result.items():
-            for dep in data['dependencies']:
-                G.add_edge(dep, aid)
-                
-        # Layout
-        try:
-            pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-        except:
-            pos = nx.shell_layout(G)
-            
-        # Draw edges
-        nx.draw_networkx_edges(G, pos, ax=ax, edge_color='#95a5a6', 
-                              arrows=True, arrowsize=20, arrowstyle='->')
-        
-        # Draw critical path edges in red
-        critical_edges = []
-        for aid, data in cpm_result.items():
-            if data['is_critical']:
-                for dep in data['dependencies']:
-                    if cpm_result[dep]['is_critical']:
-                        critical_edges.append((dep, aid))
-                        
-        nx.draw_networkx_edges(G, pos, edgelist=critical_edges, ax=ax,
-                              edge_color='#e74c3c', width=3,
-                              arrows=True, arrowsize=20, arrowstyle='->')
-        
-        # Draw nodes
-        node_colors = ['#e74c3c' if cpm_result[node]['is_critical'] else '#3498db' 
-                      for node in G.nodes()]
-        nx.draw_networkx_nodes(G, pos, ax=ax, node_color=node_colors,
-                              node_size=3000, alpha=0.9)
-        
-        # Draw labels
-        labels = {aid: f"{aid}\n{data['name'][:15]}\n{data['duration']}d" 
-                 for aid, data in cpm_result.items()}
-        nx.draw_networkx_labels(G, pos, labels, ax=ax, font_size=8,
-                               font_weight='bold', font_color='white')
+        index = self.get_schedule_index()
+        draw_network(ax, cpm_result, index.critical_edges(), index.network.level)
         
         # Use suptitle for better positioning
         fig.suptitle('Network Diagram\nKlik Kiri + Drag untuk Pan | Mouse Wheel untuk Zoom', 
                     fontsize=12, fontweight='bold', y=0.98)
-        ax.axis('off')
         
         # Adjust layout to prevent title cutoff
         plt.tight_layout(rect=[0, 0, 1, 0.95])
@@ -728,13 +2866,6 @@ class ProjectSchedulingApp:
         lbl_norm = tk.Label(legend_frame, text=" Kegiatan Normal ", bg="#3498db", fg="white", font=('Arial', 9, 'bold'))
         lbl_norm.pack(side=tk.LEFT, padx=5)
         
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.network_frame.scrollable_frame)
-        ax.axis('off')
-        
-        # Adjust layout to prevent title cutoff
-        plt.tight_layout(rect=[0, 0, 1, 0.95])
-        
         # Embed in tkinter
         canvas = FigureCanvasTkAgg(fig, master=self.network_frame.scrollable_frame)
         canvas.draw()
@@ -764,46 +2895,12 @@ class ProjectSchedulingApp:
         fig.patch.set_facecolor('#ffffff')
         
         # Sort activities by ID
-        sorted_activities = sorted(cpm_result.items(), key=lambda x: x[0])
-        
-        # Y positions
-        y_pos = range(len(sorted_activities))
-        
-        # Draw bars
-        for idx, (aid, data) in enumerate(sorted_activities):
-            color = '#e74c3c' if data['is_critical'] else '#3498db'
-            
-            # Main bar (ES to EF)
-            ax.barh(idx, data['duration'], left=data['ES'], 
-                   height=0.6, color=color, alpha=0.8,
-                   edgecolor='black', linewidth=1.5)
-            
-            # Slack bar if exists
-            if data['slack'] > 0:
-                ax.barh(idx, data['slack'], left=data['EF'],
-                       height=0.6, color='#95a5a6', alpha=0.3,
-                       edgecolor='gray', linewidth=1)
-                       
-            # Add duration text
-            mid_point = data['ES'] + data['duration'] / 2
-            ax.text(mid_point, idx, f"{data['duration']}d",
-                   ha='center', va='center', fontweight='bold',
-                   color='white', fontsize=9)
-            
-        # Labels
-        activity_labels = [f"{aid}. {data['name']}" for aid, data in sorted_activities]
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels(activity_labels, fontsize=9)
-        ax.set_xlabel('Hari', fontsize=11, fontweight='bold')
+        draw_gantt(fig, ax, sorted(cpm_result.items(), key=lambda x: x[0]))
         
         # Use suptitle for better positioning
         fig.suptitle('Gantt Chart\nKlik Kiri + Drag untuk Pan | Mouse Wheel untuk Zoom', 
                     fontsize=12, fontweight='bold', y=0.98)
         
-        # Grid
-        ax.grid(axis='x', alpha=0.3, linestyle='--')
-        ax.set_axisbelow(True)
-        
         # Adjust layout to prevent title cutoff
         plt.tight_layout(rect=[0, 0, 1, 0.95])
         
@@ -839,6 +2936,329 @@ class ProjectSchedulingApp:
         self.zoom_factory(ax)
         self.pan_factory(ax)
         
+    def import_portfolio(self):
+        filenames = filedialog.askopenfilenames(
+            title="Pilih File Proyek",
+            filetypes=[("Excel files", "*.xlsx *.xls")]
+        )
+        
+        if not filenames:
+            return
+            
+        errors = self.portfolio.load_files(filenames)
+        if errors:
+            lines = [f"{os.path.basename(f)}: {e}" for f, e in list(errors.items())[:20]]
+            if len(errors) > 20:
+                lines.append(f"... dan {len(errors) - 20} file lainnya")
+            messagebox.showerror("Error", f"{len(errors)} dari {len(filenames)} file gagal diimpor:\n" + "\n".join(lines))
+            
+        self.show_portfolio()
+        
+    def clear_portfolio(self):
+        if messagebox.askyesno("Konfirmasi", "Hapus semua proyek portfolio?"):
+            self.portfolio.clear()
+            self.show_portfolio()
+            
+    def show_portfolio(self):
+        # Clear previous content
+        for widget in self.portfolio_frame.scrollable_frame.winfo_children():
+            widget.destroy()
+            
+        # Title
+        title = tk.Label(self.portfolio_frame.scrollable_frame,
+                        text="Portfolio Proyek",
+                        font=('Arial', 16, 'bold'),
+                        bg="#ffffff", fg="#2c3e50")
+        title.pack(pady=10)
+        
+        # Buttons
+        button_frame = tk.Frame(self.portfolio_frame.scrollable_frame, bg="#ffffff")
+        button_frame.pack(pady=5)
+        
+        tk.Button(button_frame, text="📂 Import Proyek",
+                  command=self.import_portfolio,
+                  bg="#3498db", fg="white",
+                  font=('Arial', 10, 'bold'),
+                  padx=10, pady=5, cursor="hand2").pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(button_frame, text="Reset Portfolio",
+                  command=self.clear_portfolio,
+                  bg="#e74c3c", fg="white",
+                  font=('Arial', 10, 'bold'),
+                  padx=10, pady=5, cursor="hand2").pack(side=tk.LEFT, padx=5)
+        
+        if not self.portfolio.projects:
+            tk.Label(self.portfolio_frame.scrollable_frame,
+                     text="Belum ada proyek. Import beberapa file Excel sekaligus (sheet 'Links' opsional untuk dependensi antar proyek).",
+                     font=('Arial', 10), bg="#ffffff", fg="#7f8c8d", wraplength=800).pack(pady=5)
+            return
+            
+        summaries = self.portfolio.analyze()
+        try:
+            merged = self.portfolio.merged_analysis()
+        except ValueError as e:
+            merged = None
+            messagebox.showerror("Error", str(e))
+            
+        # Portfolio duration and merged critical path
+        if merged:
+            tk.Label(self.portfolio_frame.scrollable_frame,
+                     text=f"{len(self.portfolio.projects)} proyek, {len(self.portfolio.links)} tautan | "
+                          f"Total Durasi Portfolio: {merged['duration']} hari",
+                     font=('Arial', 12, 'bold'),
+                     bg="#ffffff", fg="#27ae60").pack(pady=5)
+            
+            if merged['critical_paths']:
+                path = merged['critical_paths'][0]
+                tk.Label(self.portfolio_frame.scrollable_frame,
+                         text=f"Jalur Kritis Gabungan: {format_path(f'{p}:{aid}' for p, aid in path)}",
+                         font=('Arial', 11),
+                         bg="#ffffff", fg="#e74c3c",
+                         wraplength=800, justify=tk.LEFT).pack(pady=5)
+                         
+        # Summary table
+        table_frame = tk.Frame(self.portfolio_frame.scrollable_frame, bg="#ffffff")
+        table_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+        
+        columns = ('Proyek', 'Kegiatan', 'Durasi', 'Kritis', 'Selesai Portfolio', 'Keterlambatan', 'Status')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=160 if col in ('Proyek', 'Status') else 90, anchor=tk.CENTER)
+            
+        for summary in summaries:
+            finish = merged['finish'].get(summary['project']) if merged else None
+            delay = finish - summary['duration'] if finish is not None and summary['duration'] is not None else None
+            values = (
+                summary['project'],
+                summary['activities'],
+                summary['duration'] if summary['duration'] is not None else '-',
+                summary['critical'],
+                finish if finish is not None else '-',
+                delay if delay is not None else '-',
+                summary['error'] or 'OK'
+            )
+            tag = 'late' if delay else 'normal'
+            tree.insert('', tk.END, values=values, tags=(tag,))
+            
+        tree.tag_configure('late', background='#ffcccc')
+        tree.tag_configure('normal', background='#ffffff')
+        
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+    def get_progress_tracker(self):
+        """Progress tracker for the current activities, rebuilt after an edit"""
+        if self.progress is None:
+            if not self.activities:
+                return None
+            try:
+                self.progress = ProgressTracker(self.activities)
+                self.progress.reschedule(self.get_status_date())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return None
+        return self.progress
+        
+    def get_status_date(self):
+        try:
+            return max(0, int(self.status_date.get().strip()))
+        except ValueError:
+            return 0
+            
+    def update_progress(self):
+        tracker = self.get_progress_tracker()
+        if tracker is None:
+            return
+            
+        def optional_int(var):
+            text = var.get().strip()
+            return int(text) if text else None
+            
+        try:
+            activity_id = int(self.progress_id.get().strip())
+            actual_start = optional_int(self.progress_start)
+            actual_finish = optional_int(self.progress_finish)
+            percent = float(self.progress_percent.get().strip() or 0)
+        except ValueError:
+            messagebox.showwarning("Input Error", "ID, tanggal aktual dan % selesai harus berupa angka!")
+            return
+            
+        activity = next((a for a in self.activities if a['id'] == activity_id), None)
+        if activity is None:
+            messagebox.showwarning("Input Error", f"Kegiatan {activity_id} tidak ditemukan!")
+            return
+        if not 0 <= percent <= 100:
+            messagebox.showwarning("Input Error", "% selesai harus antara 0 dan 100!")
+            return
+        if actual_finish is not None and actual_start is not None and actual_finish < actual_start:
+            messagebox.showwarning("Input Error", "Selesai aktual tidak boleh sebelum mulai aktual!")
+            return
+            
+        self.edits.update(activity_id - 1, actual_start=actual_start, actual_finish=actual_finish,
+                          percent_complete=100.0 if actual_finish is not None else percent)
+        tracker.update(activity_id, actual_start, actual_finish, activity['percent_complete'])
+        tracker.reschedule(self.get_status_date())
+        self.show_progress()
+        
+    def reschedule_progress(self):
+        tracker = self.get_progress_tracker()
+        if tracker is not None:
+            tracker.reschedule(self.get_status_date())
+        self.show_progress()
+        
+    def take_snapshot(self):
+        tracker = self.get_progress_tracker()
+        if tracker is None:
+            return
+        self.history.append(f"Hari {tracker.status_date}", tracker.columns(), tracker.metrics())
+        self.show_progress()
+        
+    def save_history(self):
+        filename = filedialog.asksaveasfilename(
+            title="Simpan Riwayat Status",
+            defaultextension=".npz",
+            filetypes=[("NumPy archive", "*.npz")]
+        )
+        if filename:
+            try:
+                self.history.save(filename)
+            except Exception as e:
+                messagebox.showerror("Error", f"Gagal menyimpan riwayat: {str(e)}")
+                
+    def load_history(self):
+        filename = filedialog.askopenfilename(
+            title="Buka Riwayat Status",
+            filetypes=[("NumPy archive", "*.npz")]
+        )
+        if filename:
+            try:
+                self.history = SnapshotHistory.load(filename)
+            except Exception as e:
+                messagebox.showerror("Error", f"Gagal membuka riwayat: {str(e)}")
+            self.show_progress()
+            
+    def show_progress(self):
+        # Clear previous content
+        for widget in self.progress_frame.scrollable_frame.winfo_children():
+            widget.destroy()
+            
+        frame = self.progress_frame.scrollable_frame
+        title = tk.Label(frame,
+                        text="Progress & Status Proyek",
+                        font=('Arial', 16, 'bold'),
+                        bg="#ffffff", fg="#2c3e50")
+        title.pack(pady=10)
+        
+        # Status date and snapshot controls
+        control_frame = tk.Frame(frame, bg="#ffffff")
+        control_frame.pack(pady=5)
+        
+        tk.Label(control_frame, text="Tanggal Status (hari ke-):",
+                 font=('Arial', 10), bg="#ffffff").pack(side=tk.LEFT)
+        ttk.Entry(control_frame, textvariable=self.status_date, width=8).pack(side=tk.LEFT, padx=5)
+        
+        for text, command, color in (("Reschedule", self.reschedule_progress, "#3498db"),
+                                     ("📸 Simpan Snapshot", self.take_snapshot, "#27ae60"),
+                                     ("💾 Simpan Riwayat", self.save_history, "#8e44ad"),
+                                     ("📂 Buka Riwayat", self.load_history, "#8e44ad")):
+            tk.Button(control_frame, text=text, command=command,
+                      bg=color, fg="white", font=('Arial', 10, 'bold'),
+                      padx=10, pady=5, cursor="hand2").pack(side=tk.LEFT, padx=5)
+            
+        # Progress update form
+        form = tk.Frame(frame, bg="#ffffff")
+        form.pack(pady=5)
+        self.progress_id = tk.StringVar()
+        self.progress_start = tk.StringVar()
+        self.progress_finish = tk.StringVar()
+        self.progress_percent = tk.StringVar()
+        for label, var in (("ID:", self.progress_id), ("Mulai Aktual:", self.progress_start),
+                           ("Selesai Aktual:", self.progress_finish), ("% Selesai:", self.progress_percent)):
+            tk.Label(form, text=label, font=('Arial', 10), bg="#ffffff").pack(side=tk.LEFT, padx=(5, 0))
+            ttk.Entry(form, textvariable=var, width=8).pack(side=tk.LEFT, padx=5)
+        tk.Button(form, text="Update Progress", command=self.update_progress,
+                  bg="#f39c12", fg="white", font=('Arial', 10, 'bold'),
+                  padx=10, pady=5, cursor="hand2").pack(side=tk.LEFT, padx=5)
+        
+        tracker = self.get_progress_tracker()
+        if tracker is None:
+            tk.Label(frame, text="Belum ada kegiatan.",
+                     font=('Arial', 10), bg="#ffffff", fg="#7f8c8d").pack(pady=5)
+            return
+            
+        metrics = tracker.metrics()
+        tk.Label(frame,
+                 text=f"Selesai {metrics['percent_complete']:.1f}% | EV {metrics['earned_value']:,.0f} | "
+                      f"PV {metrics['planned_value']:,.0f} | SPI {metrics['spi']:.2f} | "
+                      f"Perkiraan Selesai: hari {metrics['finish']} (slip {metrics['slip']:+d} hari)",
+                 font=('Arial', 12, 'bold'),
+                 bg="#ffffff", fg="#e74c3c" if metrics['slip'] > 0 else "#27ae60").pack(pady=5)
+        
+        # Per-activity forecast table
+        table_frame = tk.Frame(frame, bg="#ffffff")
+        table_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+        
+        columns = ('ID', 'Kegiatan', '% Selesai', 'Mulai Aktual', 'Selesai Aktual', 'ES', 'EF', 'Slip')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=200 if col == 'Kegiatan' else 90, anchor=tk.CENTER)
+            
+        es, ef = tracker.schedule[:2]
+        for i, activity in enumerate(self.activities):
+            slip = int(ef[i] - tracker.baseline_ef[i])
+            values = (
+                activity['id'],
+                activity['name'],
+                f"{tracker.percent[i]:.0f}",
+                tracker.actual_start[i] if tracker.actual_start[i] >= 0 else '-',
+                tracker.actual_finish[i] if tracker.actual_finish[i] >= 0 else '-',
+                es[i],
+                ef[i],
+                slip
+            )
+            tag = 'late' if slip > 0 else 'normal'
+            tree.insert('', tk.END, values=values, tags=(tag,))
+            
+        tree.tag_configure('late', background='#ffcccc')
+        tree.tag_configure('normal', background='#ffffff')
+        
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # EV and slip trend charts
+        if not len(self.history):
+            tk.Label(frame, text="Simpan snapshot untuk melihat tren EV dan slip.",
+                     font=('Arial', 10), bg="#ffffff", fg="#7f8c8d").pack(pady=5)
+            return
+            
+        trend = self.history.trend()
+        x = np.arange(len(self.history))
+        fig, (ax_ev, ax_slip) = plt.subplots(1, 2, figsize=(9, 3.5))
+        fig.patch.set_facecolor('#ffffff')
+        ax_ev.plot(x, trend['planned_value'], marker='o', color='#95a5a6', label='PV')
+        ax_ev.plot(x, trend['earned_value'], marker='o', color='#3498db', label='EV')
+        ax_ev.set_title('Earned Value', fontweight='bold')
+        ax_ev.legend()
+        ax_slip.bar(x, trend['slip'], color=np.where(trend['slip'] > 0, '#e74c3c', '#27ae60'))
+        ax_slip.set_title('Slip Jadwal (hari)', fontweight='bold')
+        for ax in (ax_ev, ax_slip):
+            ax.set_xticks(x)
+            ax.set_xticklabels(self.history.labels, rotation=45, ha='right', fontsize=8)
+            ax.grid(axis='y', alpha=0.3)
+        fig.tight_layout()
+        
+        canvas = FigureCanvasTkAgg(fig, master=frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
     def on_tab_change(self, event):
         selected_tab = event.widget.select()
         tab_text = event.widget.tab(selected_tab, "text")
@@ -849,8 +3269,53 @@ class ProjectSchedulingApp:
             self.show_network_diagram()
         elif "Gantt" in tab_text:
             self.show_gantt_chart()
+        elif "Portfolio" in tab_text:
+            self.show_portfolio()
+        elif "Progress" in tab_text:
+            self.show_progress()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project Scheduling Application - CPM & Gantt Chart")
+    parser.add_argument('--serve', action='store_true', help="jalankan scheduling service HTTP/JSON lokal")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--export-charts', nargs='+', metavar='FILE',
+                        help="ekspor Gantt & Network Diagram file Excel proyek tanpa GUI")
+    parser.add_argument('--output', default='charts', help="folder hasil ekspor grafik")
+    parser.add_argument('--formats', default='png,pdf', help="format grafik: png,svg,pdf")
+    parser.add_argument('--rows-per-page', type=int, default=GANTT_ROWS_PER_PAGE)
+    parser.add_argument('--start-date', help="tanggal mulai proyek YYYY-MM-DD (sumbu tanggal)")
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.host, args.port, args.workers or 8)
+        raise SystemExit
+        
+    if args.export_charts:
+        formats = tuple(f.strip().lower() for f in args.formats.split(',') if f.strip())
+        if not formats or any(fmt not in CHART_FORMATS for fmt in formats):
+            parser.error(f"--formats hanya boleh berisi {', '.join(CHART_FORMATS)}")
+        calendar = None
+        if args.start_date:
+            try:
+                calendar = WorkCalendar(datetime.strptime(args.start_date, '%Y-%m-%d').date())
+            except ValueError:
+                parser.error("--start-date harus berformat YYYY-MM-DD")
+        started = time.perf_counter()
+        loaded = parallel_map(read_project_file, args.export_charts, args.workers)
+        errors = {r['file']: r['error'] for r in loaded if r['error']}
+        projects = [(r['project'], r['activities']) for r in loaded if not r['error']]
+        written, chart_errors = export_charts(projects, args.output, formats, calendar,
+                                              args.rows_per_page, max_workers=args.workers)
+        errors.update(chart_errors)
+        for name, error in errors.items():
+            print(f"{name}: {error}")
+        print(f"{len(written)} file grafik ditulis ke {args.output} "
+              f"dalam {time.perf_counter() - started:.1f} detik")
+        raise SystemExit(1 if errors else 0)
+        
+    load_gui_modules()
     root = tk.Tk()
     app = ProjectSchedulingApp(root)
     